@@ -53,8 +53,8 @@ export async function POST(
     
     console.log(`Refreshing LinkedIn data for: ${companyName}`);
     
-    // Force a fresh scrape by calling the service directly
-    const profile = await linkedInService.scrapeCompany(companyName);
+    // Force a fresh scrape, bypassing the service's profile cache
+    const profile = await linkedInService.scrapeCompany(companyName, true);
     
     if (!profile) {
       return NextResponse.json(
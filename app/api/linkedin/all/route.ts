@@ -1,12 +1,14 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { linkedInService } from '@/lib/linkedin-service';
 
-// GET /api/linkedin/all - Get LinkedIn profiles for all portfolio companies
+// GET /api/linkedin/all - Get the latest LinkedIn profiles for all portfolio companies.
+// Never waits on a scrape: answers 202 with the running job's id when no completed scrape exists yet,
+// so the client can poll /api/linkedin/jobs/[jobId].
 export async function GET(request: NextRequest) {
   try {
     console.log('Fetching LinkedIn data for all portfolio companies');
     
-    const profiles = await linkedInService.scrapeAllCompanies();
+    const { profiles, completedJob, activeJob } = await linkedInService.getAllCompaniesSnapshot();
     
     const companiesCount = Object.keys(profiles).length;
     
@@ -14,9 +16,15 @@ export async function GET(request: NextRequest) {
       success: true,
       data: profiles,
       count: companiesCount,
+      complete: completedJob !== null,
+      completed_at: completedJob?.finished_at ?? null,
+      job_id: activeJob?.job_id ?? completedJob?.job_id ?? null,
+      job_status: activeJob?.status ?? completedJob?.status ?? null,
+      progress: activeJob?.progress ?? null,
+      status_url: activeJob ? `/api/linkedin/jobs/${activeJob.job_id}` : null,
       cached: !linkedInService['isServiceAvailable'], // Indicate if this is cached/mock data
       timestamp: new Date().toISOString()
-    });
+    }, { status: activeJob && !completedJob ? 202 : 200 });
     
   } catch (error) {
     console.error('Error fetching all LinkedIn data:', error);
@@ -32,25 +40,26 @@ export async function GET(request: NextRequest) {
   }
 }
 
-// POST /api/linkedin/all - Refresh LinkedIn data for all companies
+// POST /api/linkedin/all - Start a background refresh of all companies
 export async function POST(request: NextRequest) {
   try {
     console.log('Refreshing LinkedIn data for all portfolio companies');
     
-    // This might take a while, so we should probably implement this with a queue
-    // For now, let's limit the refresh to avoid long request times
-    const profiles = await linkedInService.scrapeAllCompanies();
+    const jobId = await linkedInService.startScrapeAllJob();
     
-    const companiesCount = Object.keys(profiles).length;
+    if (!jobId) {
+      return NextResponse.json(
+        { success: false, error: 'Failed to start refresh job' },
+        { status: 503 }
+      );
+    }
     
     return NextResponse.json({
       success: true,
-      data: profiles,
-      count: companiesCount,
-      refreshed: true,
-      timestamp: new Date().toISOString(),
-      note: 'For large portfolio refreshes, consider using background job processing'
-    });
+      job_id: jobId,
+      status_url: `/api/linkedin/jobs/${jobId}`,
+      timestamp: new Date().toISOString()
+    }, { status: 202 });
     
   } catch (error) {
     console.error('Error refreshing all LinkedIn data:', error);
@@ -64,4 +73,4 @@ export async function POST(request: NextRequest) {
       { status: 500 }
     );
   }
-} 
\ No newline at end of file
+}
@@ -0,0 +1,39 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { linkedInService } from '@/lib/linkedin-service';
+
+// GET /api/linkedin/jobs/[jobId] - Get progress and partial results of a refresh job
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ jobId: string }> }
+) {
+  try {
+    const { jobId } = await params;
+    
+    const job = await linkedInService.getScrapeJob(jobId, true);
+    
+    if (!job) {
+      return NextResponse.json(
+        { success: false, error: `Job ${jobId} not found` },
+        { status: 404 }
+      );
+    }
+    
+    return NextResponse.json({
+      success: true,
+      job,
+      timestamp: new Date().toISOString()
+    });
+    
+  } catch (error) {
+    console.error('Error fetching refresh job:', error);
+    
+    return NextResponse.json(
+      { 
+        success: false, 
+        error: 'Internal server error',
+        message: error instanceof Error ? error.message : 'Unknown error'
+      },
+      { status: 500 }
+    );
+  }
+}
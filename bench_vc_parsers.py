@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark the VC portfolio page parsers
+Times each HTML backend on saved pages and checks they extract the same
+companies. Pages come from .html files, from the VC page cache written by
+twitter_scraper_service.py, or from a generated synthetic portfolio page.
+
+Usage:
+    python bench_vc_parsers.py pages/*.html --url https://a16z.com/portfolio/
+    python bench_vc_parsers.py --cache vc_page_cache.sqlite3
+    python bench_vc_parsers.py --synthetic 2000
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import string
+import time
+from typing import List, Tuple
+
+from vc_page_parser import available_backends
+
+
+def synthetic_page(companies: int, seed: int = 7) -> bytes:
+    """Portfolio-style page with navigation, scripts and one card per company"""
+    rng = random.Random(seed)
+    cards = []
+    for i in range(companies):
+        name = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))).title()
+        cards.append(
+            f'<div class="portfolio-card company"><h3 class="company-name">{name} Labs</h3>'
+            f'<span class="sector">Sector {i % 12}</span><p>{name} builds tools for teams.</p>'
+            f'<a href="/companies/{name.lower()}">Read More</a></div>'
+        )
+    nav = ''.join(f'<li><a href="/{word}">{word.title()}</a></li>' for word in ['about', 'team', 'news', 'portfolio'])
+    return (
+        '<!DOCTYPE html><html><head><title>Example Ventures</title>'
+        '<script>window.__DATA__ = {"companies": []};</script><style>.card{margin:0}</style></head>'
+        f'<body><nav><ul>{nav}</ul></nav><section class="portfolio companies">{"".join(cards)}</section>'
+        '<footer>Copyright Example Ventures. All rights reserved.</footer></body></html>'
+    ).encode('utf-8')
+
+
+def load_pages(args) -> List[Tuple[str, bytes]]:
+    pages = []
+    for path in args.files:
+        with open(path, 'rb') as f:
+            pages.append((args.url or path, f.read()))
+    if args.cache:
+        conn = sqlite3.connect(args.cache)
+        for key, value in conn.execute("SELECT key, value FROM cache_entries WHERE namespace = 'vc_pages'"):
+            body = json.loads(value).get('body')
+            if body:
+                pages.append((key, body.encode('utf-8')))
+        conn.close()
+    if args.synthetic:
+        pages.append((args.url or 'https://example.vc/portfolio', synthetic_page(args.synthetic)))
+    return pages
+
+
+def time_backend(scraper, url: str, content: bytes, backend: str, repeat: int) -> Tuple[float, List[str]]:
+    scraper.parser_backend = backend
+    companies = scraper.parse_vc_page(url, content)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        scraper.parse_vc_page(url, content)
+    return (time.perf_counter() - start) / repeat, companies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*', help='saved HTML pages')
+    parser.add_argument('--url', help='URL the pages were saved from (selects the site scraper)')
+    parser.add_argument('--cache', help='VC page cache SQLite file to read page bodies from')
+    parser.add_argument('--synthetic', type=int, help='benchmark a generated page with this many companies')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = load_pages(args)
+    if not pages:
+        parser.error('no pages given; pass files, --cache or --synthetic')
+
+    from twitter_scraper_service import VCPortfolioScraper
+    scraper = VCPortfolioScraper()
+    backends = available_backends()
+
+    print(f"{'page':<48} {'KB':>7} " + ' '.join(f'{b + " ms":>10}' for b in backends) + f" {'speedup':>8}  same")
+    for url, content in pages:
+        results = {backend: time_backend(scraper, url, content, backend, args.repeat) for backend in backends}
+        timings = ' '.join(f'{results[b][0] * 1000:>10.2f}' for b in backends)
+        speedup = results['bs4'][0] / results['lxml'][0] if {'bs4', 'lxml'} <= set(results) else float('nan')
+        same = len({tuple(companies) for _, companies in results.values()}) == 1
+        print(f"{url[-48:]:<48} {len(content) / 1024:>7.1f} {timings} {speedup:>7.1f}x  {same}")
+
+
+if __name__ == '__main__':
+    main()
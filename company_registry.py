@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Portfolio company registry
+Loads companies and their LinkedIn URLs from a JSON data file and resolves
+free-text names (e.g. "Career Karma Inc.") through an exact normalized-name
+index. A trigram index ranks fuzzy candidates for a name, but a fuzzy match
+is never substituted for the name: "Modern Healthcare" is not Modern Health.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'portfolio_companies.json')
+
+# Trailing tokens that do not distinguish one company from another
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+    'plc', 'gmbh', 'ag', 'sa', 'bv', 'pbc', 'lp', 'llp'
+}
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+@dataclass
+class CompanyRecord:
+    """A registered company and the names it is known by"""
+    name: str
+    linkedin_url: str
+    aliases: List[str] = field(default_factory=list)
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents, punctuation, spacing and legal suffixes"""
+    folded = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    tokens = _TOKEN_PATTERN.findall(folded.replace('&', ' and '))
+    if tokens and tokens[0] == 'the':
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    # Joined without spaces so "Readout AI" and "ReadoutAI" share a key
+    return ''.join(tokens)
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CompanyRegistry:
+    """Company lookup by exact normalized name, with trigram-ranked candidates for unknown names"""
+
+    def __init__(self, records: Optional[List[CompanyRecord]] = None, min_similarity: float = 0.65):
+        self.min_similarity = min_similarity
+        self._records: List[CompanyRecord] = []
+        self._by_name: Dict[str, CompanyRecord] = {}
+        self._exact: Dict[str, int] = {}
+        self._keys: List[Tuple[int, str, int]] = []       # (record index, key, trigram count)
+        self._postings: Dict[str, List[int]] = {}         # trigram -> positions in _keys
+        self._lock = threading.Lock()
+
+        for record in records or []:
+            self.add(record)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, **kwargs) -> 'CompanyRegistry':
+        """Load a registry from a JSON list of {name, linkedin_url, aliases} objects"""
+        path = path or os.environ.get('COMPANY_REGISTRY_PATH', DEFAULT_REGISTRY_PATH)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            logger.warning(f"Company registry {path} not found, starting empty")
+            entries = []
+
+        registry = cls(**kwargs)
+        for entry in entries:
+            registry.add(CompanyRecord(
+                name=entry['name'],
+                linkedin_url=entry['linkedin_url'],
+                aliases=list(entry.get('aliases', []))
+            ))
+        logger.info(f"Loaded {len(registry)} companies from {path}")
+        return registry
+
+    def add(self, record: CompanyRecord):
+        """Register a company under its name and aliases"""
+        with self._lock:
+            index = len(self._records)
+            self._records.append(record)
+            self._by_name[record.name] = record
+
+            for name in [record.name] + record.aliases:
+                key = normalize_name(name)
+                if not key:
+                    continue
+                if key in self._exact and self._records[self._exact[key]].name != record.name:
+                    logger.warning(f"'{name}' already resolves to {self._records[self._exact[key]].name}")
+                    continue
+                self._exact[key] = index
+
+                grams = trigrams(key)
+                position = len(self._keys)
+                self._keys.append((index, key, len(grams)))
+                for gram in grams:
+                    self._postings.setdefault(gram, []).append(position)
+
+    def get(self, name: str) -> Optional[CompanyRecord]:
+        """Exact lookup by canonical name"""
+        return self._by_name.get(name)
+
+    def match(self, name: str, limit: int = 5) -> List[Tuple[CompanyRecord, float]]:
+        """Fuzzy candidates scoring at least min_similarity, with their Dice similarity, highest first"""
+        key = normalize_name(name)
+        if not key:
+            return []
+
+        grams = trigrams(key)
+        shared = Counter(position for gram in grams for position in self._postings.get(gram, ()))
+
+        best: Dict[int, float] = {}
+        for position, count in shared.items():
+            index, _, gram_count = self._keys[position]
+            score = 2.0 * count / (len(grams) + gram_count)
+            if score >= self.min_similarity and score > best.get(index, 0.0):
+                best[index] = score
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], len(self._records[item[0]].name)))
+        return [(self._records[index], round(score, 3)) for index, score in ranked[:limit]]
+
+    def resolve(self, name: str) -> Optional[CompanyRecord]:
+        """Resolve a name, normalized name or alias to a registered company, or None
+
+        Names that are only similar to a registered one (see match) do not resolve.
+        """
+        record = self._by_name.get(name)
+        if record:
+            return record
+
+        index = self._exact.get(normalize_name(name))
+        return self._records[index] if index is not None else None
+
+    def canonical_name(self, name: str) -> str:
+        """Registered name for a company, or the input unchanged if it is unknown"""
+        record = self.resolve(name)
+        return record.name if record else name
+
+    def linkedin_urls(self) -> Dict[str, str]:
+        """Canonical name -> LinkedIn URL, in registry order"""
+        return {record.name: record.linkedin_url for record in self._records}
+
+    def __contains__(self, name: str) -> bool:
+        return self.resolve(name) is not None
+
+    def __iter__(self) -> Iterator[CompanyRecord]:
+        return iter(list(self._records))
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+HTTP transport adapters for scrape fixtures
+Mounted on a requests session to save every VC page response to a
+FixtureStore, or to answer requests from recorded pages only.
+"""
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from scrape_fixtures import FixtureStore
+
+
+class RecordingAdapter(HTTPAdapter):
+    """HTTPAdapter that saves every response body to the fixture store"""
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        self.store = store
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if response.status_code != 304:
+            self.store.save_page(request.url, response.status_code, dict(response.headers), response.content)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter answering requests from recorded pages only"""
+
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+
+    def send(self, request, **kwargs):
+        recorded = self.store.load_page(request.url)
+        if recorded is None:
+            raise requests.ConnectionError(f"No fixture recorded for {request.url}", request=request)
+
+        status_code, headers, content = recorded
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        response.url = request.url
+        response.request = request
+        response.reason = 'Replayed'
+        return response
+
+    def close(self):
+        pass
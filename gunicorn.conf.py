@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Gunicorn settings for the scraper services
+Runs several worker processes per service so requests use every core:
+
+    gunicorn -c gunicorn.conf.py twitter_scraper_service:app
+    PORT=5000 gunicorn -c gunicorn.conf.py linkedin_scraper_service:app
+
+State that requests can change (VC URLs, job snapshots, the LinkedIn
+session) and the caches live in SQLite or encrypted files that every worker
+opens, so any worker can serve any request.
+"""
+
+import multiprocessing
+import os
+import sys
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5002)}"
+
+# Scraping is mostly waiting on the network and on Chrome, so a few threaded
+# workers go further than one sync worker per core
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count(), 4)))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+# Rate limiters, job executors and the Chrome driver pool split the configured
+# sizes across this many processes
+os.environ['WEB_CONCURRENCY'] = str(workers)
+
+# Each worker imports the app itself: SQLite connections, driver pools and
+# executor threads must not be created before the fork
+preload_app = False
+
+# Bulk scrapes and event streams hold a request open for minutes
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 600))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info')
+
+
+def worker_exit(server, worker):
+    """Quit Chrome and stop job executors when a worker exits
+
+    Workers leave through os._exit, so atexit handlers registered by the
+    services never run there.
+    """
+    for name in ('linkedin_scraper_service', 'twitter_scraper_service'):
+        service = sys.modules.get(name)
+        if service is not None:
+            service.shutdown()
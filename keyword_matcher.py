@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Multi-pattern keyword matching
+Aho-Corasick automaton built once from groups of keywords, so a single
+scan over a text reports every group's matched keywords.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Case-insensitive matcher for labelled keyword groups"""
+
+    def __init__(self, groups: Dict[str, Iterable[str]], word_boundaries: bool = False):
+        self.word_boundaries = word_boundaries
+        self.groups = {group: list(keywords) for group, keywords in groups.items()}
+
+        # Each state maps char -> next state; outputs hold (group, keyword, length)
+        self._transitions: List[Dict[str, int]] = [{}]
+        self._outputs: List[List[Tuple[str, str, int]]] = [[]]
+
+        for group, keywords in self.groups.items():
+            for keyword in keywords:
+                self._add(group, keyword)
+
+        self._build()
+
+    def _add(self, group: str, keyword: str):
+        pattern = keyword.lower()
+        if not pattern:
+            return
+
+        state = 0
+        for char in pattern:
+            next_state = self._transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self._transitions)
+                self._transitions[state][char] = next_state
+                self._transitions.append({})
+                self._outputs.append([])
+            state = next_state
+
+        self._outputs[state].append((group, keyword, len(pattern)))
+
+    def _build(self):
+        """Compute failure links and fold them into a complete transition table"""
+        trie = [dict(transitions) for transitions in self._transitions]
+        fail = [0] * len(trie)
+        order = []
+
+        queue = deque(trie[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for char, child in trie[state].items():
+                fallback = fail[state]
+                while fallback and char not in trie[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = trie[fallback].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[fail[child]]
+                queue.append(child)
+
+        # Resolve failure transitions ahead of time so scanning needs one lookup per char
+        for state in order:
+            resolved = dict(self._transitions[fail[state]])
+            resolved.update(trie[state])
+            self._transitions[state] = resolved
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        """Return the matched keywords of each group in a single pass over text"""
+        text_lower = text.lower()
+        transitions = self._transitions
+        outputs = self._outputs
+        word_boundaries = self.word_boundaries
+        matches: Dict[str, Set[str]] = {}
+        state = 0
+
+        for index, char in enumerate(text_lower):
+            state = transitions[state].get(char, 0)
+            found = outputs[state]
+            if not found:
+                continue
+
+            for group, keyword, length in found:
+                if word_boundaries and not self._on_boundaries(text_lower, index - length + 1, index + 1):
+                    continue
+                matches.setdefault(group, set()).add(keyword)
+
+        return matches
+
+    @staticmethod
+    def _on_boundaries(text: str, start: int, end: int) -> bool:
+        before = text[start - 1] if start > 0 else ' '
+        after = text[end] if end < len(text) else ' '
+        return not before.isalnum() and not after.isalnum()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Deferred imports for heavy dependencies
+Services bind pandas, numpy, requests, Selenium and friends to module
+proxies that import the real module on first attribute access, so a worker
+starts (and answers /health) without paying for libraries it has not used.
+"""
+
+import importlib
+import importlib.util
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported the first time it is used"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._load(), attr)
+        # Cache on the proxy so later lookups skip __getattr__
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_module(name: str) -> types.ModuleType:
+    """Proxy for `import name` that defers the import until an attribute is read"""
+    return LazyModule(name)
+
+
+def is_available(name: str) -> bool:
+    """Whether a top-level package is installed, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
@@ -41,6 +41,28 @@ export interface LinkedInServiceResponse<T> {
   count?: number;
 }
 
+export interface LinkedInScrapeJob {
+  job_id: string;
+  kind: string;
+  status: 'queued' | 'running' | 'completed' | 'failed';
+  progress: {
+    completed: number;
+    total: number | null;
+  };
+  created_at: number;
+  finished_at?: number | null;
+  error?: string | null;
+  results?: Record<string, LinkedInCompanyProfile>;
+}
+
+export interface LinkedInProfilesSnapshot {
+  profiles: Record<string, LinkedInCompanyProfile>;
+  // Latest finished scrape the profiles come from, if any
+  completedJob: LinkedInScrapeJob | null;
+  // Scrape in progress, to be polled through /api/linkedin/jobs/[jobId]
+  activeJob: LinkedInScrapeJob | null;
+}
+
 class LinkedInService {
   private baseUrl: string;
   private isServiceAvailable: boolean = false;
@@ -100,16 +122,17 @@ class LinkedInService {
   }
 
   /**
-   * Scrape a specific company's LinkedIn profile
+   * Scrape a specific company's LinkedIn profile (served from the service cache unless forceRefresh)
    */
-  async scrapeCompany(companyName: string): Promise<LinkedInCompanyProfile | null> {
+  async scrapeCompany(companyName: string, forceRefresh: boolean = false): Promise<LinkedInCompanyProfile | null> {
     if (!this.isServiceAvailable) {
       console.warn('LinkedIn scraper service not available, returning mock data');
       return this.getMockCompanyData(companyName);
     }
 
     try {
-      const response = await fetch(`${this.baseUrl}/scrape/${encodeURIComponent(companyName)}`, {
+      const query = forceRefresh ? '?refresh=true' : '';
+      const response = await fetch(`${this.baseUrl}/scrape/${encodeURIComponent(companyName)}${query}`, {
         method: 'GET',
         headers: { 'Content-Type': 'application/json' },
       });
@@ -129,32 +152,143 @@ class LinkedInService {
   }
 
   /**
-   * Scrape all portfolio companies
+   * Profiles of all portfolio companies without waiting on a scrape: the results of the latest
+   * completed job (or the partial results of the one in progress). A job is only started when
+   * none is running, so repeated calls never queue duplicate scrapes.
    */
-  async scrapeAllCompanies(): Promise<Record<string, LinkedInCompanyProfile>> {
+  async getAllCompaniesSnapshot(): Promise<LinkedInProfilesSnapshot> {
     if (!this.isServiceAvailable) {
       console.warn('LinkedIn scraper service not available, returning mock data');
-      return this.getAllMockCompanyData();
+      return { profiles: this.getAllMockCompanyData(), completedJob: null, activeJob: null };
+    }
+
+    try {
+      const jobs = (await this.listScrapeJobs('scrape_all')).reverse();
+      const completed = jobs.find(job => job.status === 'completed');
+      let active = jobs.find(job => job.status === 'queued' || job.status === 'running') || null;
+
+      if (!active && !completed) {
+        const jobId = await this.startScrapeAllJob();
+        active = jobId ? await this.getScrapeJob(jobId) : null;
+        if (!active) {
+          return { profiles: this.getAllMockCompanyData(), completedJob: null, activeJob: null };
+        }
+      }
+
+      const completedJob = completed ? await this.getScrapeJob(completed.job_id, true) : null;
+      const activeJob = active && !completedJob ? await this.getScrapeJob(active.job_id, true) : active;
+
+      return {
+        profiles: completedJob?.results || activeJob?.results || {},
+        completedJob,
+        activeJob,
+      };
+    } catch (error) {
+      console.error('Error getting all company profiles:', error);
+      return { profiles: this.getAllMockCompanyData(), completedJob: null, activeJob: null };
+    }
+  }
+
+  /**
+   * Background jobs known to the service, oldest first, optionally of one kind
+   */
+  async listScrapeJobs(kind?: string): Promise<LinkedInScrapeJob[]> {
+    const response = await fetch(`${this.baseUrl}/jobs`, {
+      method: 'GET',
+      headers: { 'Content-Type': 'application/json' },
+    });
+
+    const result = await response.json();
+    const jobs: LinkedInScrapeJob[] = result.jobs || [];
+    return kind ? jobs.filter(job => job.kind === kind) : jobs;
+  }
+
+  /**
+   * Start a background scrape of all portfolio companies, returning its job id
+   * (the service returns the job already in progress instead of queueing another)
+   */
+  async startScrapeAllJob(): Promise<string | null> {
+    try {
+      const response = await fetch(`${this.baseUrl}/jobs/scrape_all`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+      });
+
+      const result = await response.json();
+      return result.success ? result.job_id : null;
+    } catch (error) {
+      console.error('Error starting scrape job:', error);
+      return null;
     }
+  }
 
+  /**
+   * Get status (and optionally partial results) of a background scrape job
+   */
+  async getScrapeJob(jobId: string, includeResults: boolean = false): Promise<LinkedInScrapeJob | null> {
     try {
-      const response = await fetch(`${this.baseUrl}/scrape/all`, {
+      const path = includeResults ? `/jobs/${encodeURIComponent(jobId)}/results` : `/jobs/${encodeURIComponent(jobId)}`;
+      const response = await fetch(`${this.baseUrl}${path}`, {
         method: 'GET',
         headers: { 'Content-Type': 'application/json' },
       });
 
-      const result: LinkedInServiceResponse<Record<string, LinkedInCompanyProfile>> = await response.json();
-      
-      if (result.success && result.data) {
-        return result.data;
+      const result = await response.json();
+      return result.success ? result.job : null;
+    } catch (error) {
+      console.error(`Error getting scrape job ${jobId}:`, error);
+      return null;
+    }
+  }
+
+  /**
+   * Scrape all portfolio companies over an NDJSON stream, calling onProfile as each one completes.
+   * Resolves with the number of profiles received.
+   */
+  async streamAllCompanies(
+    onProfile: (companyName: string, profile: LinkedInCompanyProfile) => void
+  ): Promise<number> {
+    if (!this.isServiceAvailable) {
+      const mockData = this.getAllMockCompanyData();
+      Object.entries(mockData).forEach(([name, profile]) => onProfile(name, profile));
+      return Object.keys(mockData).length;
+    }
+
+    let received = 0;
+    try {
+      const response = await fetch(`${this.baseUrl}/scrape/all?stream=ndjson`, {
+        method: 'GET',
+        headers: { Accept: 'application/x-ndjson' },
+      });
+      if (!response.ok || !response.body) {
+        return received;
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffered = '';
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+
+        buffered += decoder.decode(value, { stream: true });
+        const lines = buffered.split('\n');
+        buffered = lines.pop() || '';
+
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const event = JSON.parse(line);
+          if (event.type === 'result' && event.success && event.data) {
+            onProfile(event.company, event.data);
+            received++;
+          }
+        }
       }
-      
-      console.warn('Failed to scrape all companies:', result.error);
-      return this.getAllMockCompanyData();
     } catch (error) {
-      console.error('Error scraping all companies:', error);
-      return this.getAllMockCompanyData();
+      console.error('Error streaming company profiles:', error);
     }
+    return received;
   }
 
   /**
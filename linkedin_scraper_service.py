@@ -5,25 +5,38 @@ Uses the linkedin_scraper library to gather company information.
 """
 
 import json
-import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 from dataclasses import dataclass, asdict
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import time
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import WebDriverException
+import queue
+import threading
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from company_registry import CompanyRegistry
+from lazy_import import is_available, lazy_module
+from metrics import CACHE_REQUESTS, CONTENT_TYPE, REGISTRY, stage, timed
+from rate_limiter import CircuitOpenError, RateLimiter, worker_processes, worker_share
+from scrape_fixtures import COMPANY_FIELDS, FixtureStore, fixtures_from_env
+from scrape_jobs import Job, JobManager
+from shared_state import SharedState
+from session_store import WRITE_LOCAL_STORAGE_SCRIPT, BrowserSession, SessionStore, is_logged_out_url
+from streaming import stream_format, streaming_response
+from ttl_cache import SQLiteTTLCache
 
-# Import the linkedin_scraper library
-try:
-    from linkedin_scraper import Company, Person, actions
-    LINKEDIN_SCRAPER_AVAILABLE = True
-except ImportError:
+# Selenium and the linkedin_scraper library are imported when the first driver is needed,
+# so /health and /companies answer without loading them
+webdriver = lazy_module('selenium.webdriver')
+selenium_exceptions = lazy_module('selenium.common.exceptions')
+linkedin_scraper = lazy_module('linkedin_scraper')
+linkedin_actions = lazy_module('linkedin_scraper.actions')
+LINKEDIN_SCRAPER_AVAILABLE = is_available('linkedin_scraper')
+if not LINKEDIN_SCRAPER_AVAILABLE:
     print("Warning: linkedin_scraper not installed. Run: pip install linkedin_scraper")
-    LINKEDIN_SCRAPER_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -58,57 +71,210 @@ class CompanyPost:
     media_urls: List[str]
     post_url: str
 
+class DriverPool:
+    """Bounded pool of Chrome drivers that share one authenticated LinkedIn session"""
+    
+    def __init__(self, factory, size: int = 2, checkout_timeout: float = 120.0):
+        self.factory = factory
+        self.size = max(1, size)
+        self.checkout_timeout = checkout_timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._session_cookies: List[Dict[str, Any]] = []
+        self._session_storage: Dict[str, str] = {}
+        self._session_version = 0
+        self._driver_versions: Dict[int, int] = {}
+    
+    def checkout(self, timeout: Optional[float] = None):
+        """Take a healthy driver from the pool, creating one if below capacity"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._create_if_below_capacity()
+                if driver is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("No Chrome driver available in pool")
+                    try:
+                        driver = self._idle.get(timeout=remaining)
+                    except queue.Empty:
+                        raise TimeoutError("No Chrome driver available in pool")
+            
+            if self._is_healthy(driver):
+                self.sync_session(driver)
+                return driver
+            
+            logger.warning("Discarding unhealthy Chrome driver")
+            self._discard(driver)
+    
+    def checkin(self, driver, healthy: bool = True):
+        """Return a driver to the pool, discarding it if it is broken"""
+        if driver is None:
+            return
+        if healthy and self._is_healthy(driver):
+            self._idle.put(driver)
+        else:
+            self._discard(driver)
+    
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """Context manager wrapping checkout/checkin"""
+        driver = self.checkout(timeout)
+        healthy = True
+        try:
+            yield driver
+        except selenium_exceptions.WebDriverException:
+            healthy = False
+            raise
+        finally:
+            self.checkin(driver, healthy=healthy)
+    
+    def share_session(self, cookies: List[Dict[str, Any]], local_storage: Optional[Dict[str, str]] = None,
+                      source=None):
+        """Store session cookies and local storage so every pooled driver reuses the same login"""
+        with self._lock:
+            self._session_cookies = list(cookies)
+            self._session_storage = dict(local_storage or {})
+            self._session_version += 1
+            if source is not None:
+                # The driver that produced the session already has it
+                self._driver_versions[id(source)] = self._session_version
+    
+    def close_all(self):
+        """Quit every idle driver and reset the pool"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": self._idle.qsize()
+            }
+    
+    def _create_if_below_capacity(self):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+        
+        driver = None
+        try:
+            driver = self.factory()
+        finally:
+            if driver is None:
+                with self._lock:
+                    self._created -= 1
+        
+        if driver is None:
+            raise RuntimeError("Failed to initialize Chrome driver")
+        return driver
+    
+    def _discard(self, driver):
+        with self._lock:
+            self._created -= 1
+            self._driver_versions.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting driver: {e}")
+    
+    def _is_healthy(self, driver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+    
+    def sync_session(self, driver):
+        """Give a driver the latest shared session unless it already has it"""
+        with self._lock:
+            version = self._session_version
+            cookies = list(self._session_cookies)
+            local_storage = dict(self._session_storage)
+        
+        if not cookies or self._driver_versions.get(id(driver)) == version:
+            return
+        
+        try:
+            driver.get("https://www.linkedin.com/")
+            for cookie in cookies:
+                cookie = {k: v for k, v in cookie.items() if k != 'sameSite'}
+                driver.add_cookie(cookie)
+            if local_storage:
+                driver.execute_script(WRITE_LOCAL_STORAGE_SCRIPT, local_storage)
+            with self._lock:
+                self._driver_versions[id(driver)] = version
+        except selenium_exceptions.WebDriverException as e:
+            logger.warning(f"Failed to share LinkedIn session with driver: {e}")
+
 class LinkedInScraperService:
     """Service for scraping LinkedIn company data"""
     
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, pool_size: Optional[int] = None,
+                 registry: Optional[CompanyRegistry] = None, fixtures: Optional[FixtureStore] = None):
         self.headless = headless
-        self.driver = None
         self.authenticated = False
+        self.fixtures = fixtures or fixtures_from_env()
         
-                 # Portfolio companies with their LinkedIn URLs
-         self.portfolio_companies = {
-             "Akido": "https://www.linkedin.com/company/akido-labs/",
-            "AllVoices": "https://www.linkedin.com/company/allvoices/",
-            "Alyf": "https://www.linkedin.com/company/alyf/",
-            "Arc": "https://www.linkedin.com/company/arc-boats/", 
-            "Brelium": "https://www.linkedin.com/company/brelium/",
-            "Career Karma": "https://www.linkedin.com/company/careerkarma/",
-            "Copper": "https://www.linkedin.com/company/copper-electric/",
-            "EnsoData": "https://www.linkedin.com/company/ensodata/",
-            "EveryCare": "https://www.linkedin.com/company/everycare/",
-            "Farmers Business Network": "https://www.linkedin.com/company/farmers-business-network/",
-            "Forage": "https://www.linkedin.com/company/forage-payments/",
-            "Infinite Machine": "https://www.linkedin.com/company/infinite-machine/",
-            "Insightful Instruments": "https://www.linkedin.com/company/insightful-instruments/",
-            "Kurios": "https://www.linkedin.com/company/kurios/",
-            "Magrathea": "https://www.linkedin.com/company/magrathea-metals/",
-            "MedTruly": "https://www.linkedin.com/company/medtruly/",
-            "Mental": "https://www.linkedin.com/company/mental/",
-            "Modern Health": "https://www.linkedin.com/company/modern-health/",
-            "Moov": "https://www.linkedin.com/company/moov-semiconductor/",
-            "Nevoya": "https://www.linkedin.com/company/nevoya/",
-            "Nomba": "https://www.linkedin.com/company/nomba/",
-            "OneImaging": "https://www.linkedin.com/company/oneimaging/",
-            "Perceptive": "https://www.linkedin.com/company/perceptive-dentistry/",
-            "Plural Energy": "https://www.linkedin.com/company/plural-energy/",
-            "ReadoutAI": "https://www.linkedin.com/company/readout-ai/",
-            "Recursion": "https://www.linkedin.com/company/recursion-pharmaceuticals/",
-            "Relief": "https://www.linkedin.com/company/relief-financial/",
-            "Taro": "https://www.linkedin.com/company/taro-health/",
-            "Terra Energy": "https://www.linkedin.com/company/terra-energy/",
-            "Unlearn": "https://www.linkedin.com/company/unlearn-ai/",
-            "Vicarious Surgical": "https://www.linkedin.com/company/vicarious-surgical/",
-            "Wayve": "https://www.linkedin.com/company/wayve/",
-            "Zocalo Health": "https://www.linkedin.com/company/zocalo-health/"
-        }
+        if pool_size is None:
+            # A budget for the whole service, like the rate limits below
+            pool_size = worker_share(int(os.environ.get('LINKEDIN_DRIVER_POOL_SIZE', 2)))
+        self.driver_pool = DriverPool(self._setup_driver, size=pool_size)
+        
+        # Global request budget plus a LinkedIn token bucket that backs off and trips a breaker on failures
+        self.rate_limiter = RateLimiter(
+            requests_per_second=float(os.environ.get('LINKEDIN_SCRAPE_RPS', 1.0)),
+            domain_interval=float(os.environ.get('LINKEDIN_DOMAIN_INTERVAL', 2.0)),
+            processes=worker_processes()
+        )
+        # Failed company fetches are re-attempted this many times, after the limiter's backoff
+        self.scrape_retries = int(os.environ.get('LINKEDIN_SCRAPE_RETRIES', 1))
+        
+        # Persistent profile cache; stale entries are served while a background refresh runs
+        self.profile_cache = SQLiteTTLCache(
+            os.environ.get('LINKEDIN_CACHE_PATH', 'linkedin_profile_cache.sqlite3'),
+            default_ttl=float(os.environ.get('LINKEDIN_CACHE_TTL', 3600)),
+            max_entries=int(os.environ.get('LINKEDIN_CACHE_MAX_ENTRIES', 1000)),
+            namespace='company_profiles'
+        )
+        self._refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="linkedin-refresh")
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        
+        # Portfolio companies with their LinkedIn URLs, loaded from the shared registry data file
+        self.registry = registry or CompanyRegistry.load()
+        self.portfolio_companies = self.registry.linkedin_urls()
+        
+        # Login cookies and local storage persist across restarts and are only re-checked
+        # against LinkedIn on first use and every LINKEDIN_SESSION_CHECK_INTERVAL seconds
+        self.session_store = SessionStore.from_env()
+        self.session_check_interval = float(os.environ.get('LINKEDIN_SESSION_CHECK_INTERVAL', 900))
+        self._session_checked_at: Optional[float] = None
+        self._session_version = None
+        self._session_lock = threading.Lock()
+        self._credentials: Optional[Tuple[str, str]] = None
+        if os.environ.get('LINKEDIN_EMAIL') and os.environ.get('LINKEDIN_PASSWORD'):
+            self._credentials = (os.environ['LINKEDIN_EMAIL'], os.environ['LINKEDIN_PASSWORD'])
+        self._restore_session()
     
+    @timed('linkedin_driver_setup')
     def _setup_driver(self):
-        """Setup Chrome driver for scraping"""
+        """Create a Chrome driver for scraping, or None on failure"""
         if not LINKEDIN_SCRAPER_AVAILABLE:
             raise Exception("linkedin_scraper library not available")
             
-        chrome_options = Options()
+        chrome_options = webdriver.ChromeOptions()
         if self.headless:
             chrome_options.add_argument("--headless")
         chrome_options.add_argument("--no-sandbox")
@@ -118,48 +284,154 @@ class LinkedInScraperService:
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
         
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
+            driver = webdriver.Chrome(options=chrome_options)
             logger.info("Chrome driver initialized successfully")
-            return True
-        except WebDriverException as e:
+            return driver
+        except selenium_exceptions.WebDriverException as e:
             logger.error(f"Failed to initialize Chrome driver: {e}")
-            return False
+            return None
     
-    def authenticate(self, email: str, password: str) -> bool:
-        """Authenticate with LinkedIn"""
-        if not self.driver:
-            if not self._setup_driver():
-                return False
-        
+    def authenticate(self, email: str, password: str, force: bool = False) -> bool:
+        """Authenticate with LinkedIn, reusing a still valid persisted session unless forced"""
+        self._credentials = (email, password)
         try:
-            actions.login(self.driver, email, password)
-            self.authenticated = True
-            logger.info("Successfully authenticated with LinkedIn")
+            with self.driver_pool.driver() as driver:
+                with self._session_lock:
+                    self._restore_session(driver)
+                    if not force and self.authenticated and self._session_is_valid(driver):
+                        self._session_checked_at = time.monotonic()
+                        logger.info("Reusing persisted LinkedIn session")
+                        return True
+                    self._login(driver, reuse_newer=not force)
             return True
         except Exception as e:
             logger.error(f"Authentication failed: {e}")
             return False
     
+    def _login(self, driver, reuse_newer: bool = True):
+        """Log in with the stored credentials, then share and persist the new session
+        
+        Worker processes take the session file lock in turn, so when several find the
+        session expired at once only the first logs in and the rest reuse its session.
+        """
+        with self.session_store.lock() if self.session_store else nullcontext():
+            if self._restore_session(driver) and reuse_newer and self._session_is_valid(driver):
+                self._session_checked_at = time.monotonic()
+                logger.info("Reusing LinkedIn session from another worker")
+                return
+            
+            email, password = self._credentials
+            linkedin_actions.login(driver, email, password)
+            
+            session = BrowserSession.capture(driver)
+            self.driver_pool.share_session(session.cookies, session.local_storage, source=driver)
+            if self.session_store:
+                self.session_store.save(session)
+                self._session_version = self.session_store.version()
+        self.authenticated = True
+        self._session_checked_at = time.monotonic()
+        logger.info("Successfully authenticated with LinkedIn")
+    
+    def _restore_session(self, driver=None) -> bool:
+        """Load the persisted session into the pool without opening a browser
+        
+        Only reads the file when it changed since the last call, so it is cheap to call
+        before each use to pick up a login or logout by another worker process. A driver
+        that is already checked out gets the loaded session too. Returns whether a
+        session was loaded.
+        """
+        if not self.session_store:
+            return False
+        version = self.session_store.version()
+        if version == self._session_version:
+            return False
+        self._session_version = version
+        
+        session = self.session_store.load() if version else None
+        if session is None:
+            if self.authenticated:
+                logger.info("Persisted LinkedIn session was cleared by another worker")
+                self.authenticated = False
+                self._session_checked_at = None
+                self.driver_pool.share_session([])
+            return False
+        if session.is_expired:
+            logger.info("Persisted LinkedIn session has expired")
+            self.session_store.clear()
+            self._session_version = None
+            return False
+        
+        self.driver_pool.share_session(session.cookies, session.local_storage)
+        if driver is not None:
+            self.driver_pool.sync_session(driver)
+        self.authenticated = True
+        self._session_checked_at = None
+        logger.info("Restored persisted LinkedIn session")
+        return True
+    
+    def _session_is_valid(self, driver) -> bool:
+        driver.get("https://www.linkedin.com/feed/")
+        return not is_logged_out_url(driver.current_url)
+    
+    def _ensure_session(self, driver):
+        """Validate the shared session lazily, logging in again only once it has expired"""
+        with self._session_lock:
+            self._restore_session(driver)
+            if not self.authenticated and not self._credentials:
+                return
+            
+            checked_at = self._session_checked_at
+            if self.authenticated and checked_at is not None and time.monotonic() - checked_at < self.session_check_interval:
+                return
+            
+            if self.authenticated and self._session_is_valid(driver):
+                self._session_checked_at = time.monotonic()
+                return
+            
+            if self.authenticated:
+                logger.warning("LinkedIn session has expired")
+                self._expire_session()
+            if self._credentials:
+                self._login(driver)
+    
+    def _expire_session(self):
+        self.authenticated = False
+        self._session_checked_at = None
+        self.driver_pool.share_session([])
+        if self.session_store:
+            self.session_store.clear()
+            self._session_version = None
+    
+    def session_info(self) -> Dict[str, Any]:
+        """Persistence and validation state of the LinkedIn session"""
+        session = self.session_store.load() if self.session_store else None
+        checked_at = self._session_checked_at
+        return {
+            "persisted": session is not None,
+            "saved_at": session.saved_at if session else None,
+            "expires_at": session.expires_at if session else None,
+            "validated_seconds_ago": round(time.monotonic() - checked_at, 1) if checked_at is not None else None
+        }
+    
+    @timed('linkedin_scrape_company')
     def scrape_company(self, company_name: str) -> Optional[CompanyProfile]:
         """Scrape a single company's LinkedIn profile"""
-        if company_name not in self.portfolio_companies:
+        record = self.registry.resolve(company_name)
+        if not record:
             logger.warning(f"Company {company_name} not found in portfolio")
             return None
-            
-        linkedin_url = self.portfolio_companies[company_name]
         
-        try:
-            if not self.driver:
-                if not self._setup_driver():
-                    return None
-                    
+        company_name = record.name
+        linkedin_url = record.linkedin_url
+        
+        def fetch_profile() -> CompanyProfile:
             logger.info(f"Scraping company: {company_name}")
-            
-            # Create Company object and scrape
-            company = Company(linkedin_url, driver=self.driver, scrape=True, close_on_complete=False)
+            with stage('linkedin_company_fetch') as span:
+                company = self._fetch_company(linkedin_url)
+                span.items = 1
             
             # Extract company data
-            profile = CompanyProfile(
+            return CompanyProfile(
                 name=company.name or company_name,
                 linkedin_url=linkedin_url,
                 about=company.about_us,
@@ -172,13 +444,83 @@ class LinkedInScraperService:
                 employee_count=self._parse_employee_count(company.company_size),
                 last_updated=time.strftime("%Y-%m-%d %H:%M:%S")
             )
-            
-            logger.info(f"Successfully scraped {company_name}")
-            return profile
-            
+        
+        try:
+            profile = self.rate_limiter.call_with_retries(linkedin_url, fetch_profile, self.scrape_retries)
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping {company_name}: {e}")
+            return None
         except Exception as e:
             logger.error(f"Error scraping {company_name}: {e}")
             return None
+        
+        logger.info(f"Successfully scraped {company_name}")
+        return profile
+    
+    def _fetch_company(self, linkedin_url: str):
+        """Scrape a LinkedIn company page, or replay its recorded fields"""
+        if self.fixtures and self.fixtures.replaying:
+            fields = self.fixtures.load_company(linkedin_url)
+            if fields is None:
+                raise LookupError(f"No fixture recorded for {linkedin_url}")
+            return SimpleNamespace(**{field: fields.get(field) for field in COMPANY_FIELDS})
+        
+        with self.driver_pool.driver() as driver:
+            self._ensure_session(driver)
+            try:
+                # Create Company object and scrape
+                company = linkedin_scraper.Company(linkedin_url, driver=driver, scrape=True, close_on_complete=False)
+            except Exception:
+                if self.authenticated and is_logged_out_url(driver.current_url):
+                    # Bounced to a login page: re-validate on the next fetch
+                    self._session_checked_at = None
+                raise
+        
+        if self.fixtures and self.fixtures.recording:
+            self.fixtures.save_company(linkedin_url, {field: getattr(company, field, None) for field in COMPANY_FIELDS})
+        return company
+    
+    def refresh_company(self, company_name: str) -> Optional[CompanyProfile]:
+        """Scrape a company and store the fresh profile in the cache"""
+        company_name = self.registry.canonical_name(company_name)
+        profile = self.scrape_company(company_name)
+        if profile:
+            self.profile_cache.set(company_name, asdict(profile))
+        return profile
+    
+    def get_company_profile(self, company_name: str, refresh: bool = False) -> Tuple[Optional[CompanyProfile], str]:
+        """Get a company profile, preferring the cache; returns (profile, cache status)"""
+        # Cache entries are keyed by canonical name so name variants share one profile
+        company_name = self.registry.canonical_name(company_name)
+        
+        if not refresh:
+            entry = self.profile_cache.get(company_name)
+            if entry:
+                if entry.is_stale:
+                    self._schedule_refresh(company_name)
+                    CACHE_REQUESTS.inc(cache='linkedin_profiles', result='stale')
+                    return CompanyProfile(**entry.value), 'stale'
+                CACHE_REQUESTS.inc(cache='linkedin_profiles', result='hit')
+                return CompanyProfile(**entry.value), 'hit'
+        
+        CACHE_REQUESTS.inc(cache='linkedin_profiles', result='refresh' if refresh else 'miss')
+        return self.refresh_company(company_name), 'miss'
+    
+    def _schedule_refresh(self, company_name: str):
+        """Refresh a stale profile in the background, at most once at a time per company"""
+        with self._refresh_lock:
+            if company_name in self._refreshing:
+                return
+            self._refreshing.add(company_name)
+        
+        def run():
+            try:
+                self.refresh_company(company_name)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(company_name)
+        
+        self._refresh_executor.submit(run)
     
     def _parse_employee_count(self, company_size: str) -> Optional[int]:
         """Parse employee count from company size string"""
@@ -193,17 +535,42 @@ class LinkedInScraperService:
             return int(numbers[0])
         return None
     
-    def scrape_all_companies(self) -> Dict[str, CompanyProfile]:
+    def iter_scrape_all_companies(self, max_workers: Optional[int] = None) -> Iterator[Tuple[str, Optional[CompanyProfile]]]:
+        """Scrape all portfolio companies concurrently, yielding results as they complete"""
+        max_workers = max_workers or self.driver_pool.size
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="linkedin-scrape")
+        
+        try:
+            futures = {
+                executor.submit(self.refresh_company, company_name): company_name
+                for company_name in self.portfolio_companies
+            }
+            for future in as_completed(futures):
+                company_name = futures[future]
+                try:
+                    yield company_name, future.result()
+                except Exception as e:
+                    logger.error(f"Error scraping {company_name}: {e}")
+                    yield company_name, None
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def scrape_all_companies(self, concurrent: bool = True, max_workers: Optional[int] = None) -> Dict[str, CompanyProfile]:
         """Scrape all portfolio companies"""
         results = {}
         
+        if concurrent:
+            for company_name, profile in self.iter_scrape_all_companies(max_workers):
+                if profile:
+                    results[company_name] = profile
+            
+            # Keep portfolio order regardless of completion order
+            return {name: results[name] for name in self.portfolio_companies if name in results}
+        
         for company_name in self.portfolio_companies.keys():
-            profile = self.scrape_company(company_name)
+            profile = self.refresh_company(company_name)
             if profile:
                 results[company_name] = profile
-            
-            # Add delay between requests to be respectful
-            time.sleep(2)
         
         return results
     
@@ -215,10 +582,9 @@ class LinkedInScraperService:
     
     def close(self):
         """Clean up resources"""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
-            logger.info("Driver closed")
+        self._refresh_executor.shutdown(wait=False, cancel_futures=True)
+        self.driver_pool.close_all()
+        logger.info("Driver pool closed")
 
 # Flask app for serving the scraper as a web service
 app = Flask(__name__)
@@ -227,15 +593,56 @@ CORS(app)
 # Global scraper instance
 scraper = LinkedInScraperService(headless=True)
 
+# Background jobs for long-running bulk scrapes; snapshots are shared so any worker process can answer a poll
+job_manager = JobManager(
+    max_concurrent_jobs=worker_share(int(os.environ.get('SCRAPE_JOB_WORKERS', 1))),
+    store=SharedState(os.environ.get('LINKEDIN_STATE_PATH', 'linkedin_state.sqlite3'))
+)
+
+def shutdown():
+    """Quit the Chrome drivers and record unfinished jobs as failed; run when the process exits"""
+    job_manager.shutdown()
+    scraper.close()
+
+def run_scrape_all_job(job: Job, max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Job body for a full portfolio scrape, publishing each profile as it completes"""
+    job.set_total(len(scraper.portfolio_companies))
+    failed = []
+    
+    for company_name, profile in scraper.iter_scrape_all_companies(max_workers):
+        if profile:
+            job.add_result(company_name, asdict(profile))
+        else:
+            failed.append(company_name)
+            job.advance()
+    
+    return {
+        "count": len(job.results),
+        "failed": failed
+    }
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
         "status": "healthy",
         "linkedin_scraper_available": LINKEDIN_SCRAPER_AVAILABLE,
-        "authenticated": scraper.authenticated
+        "authenticated": scraper.authenticated,
+        "session": scraper.session_info(),
+        "driver_pool": scraper.driver_pool.stats(),
+        "rate_limits": scraper.rate_limiter.stats()
     })
 
+DRIVER_POOL_DRIVERS = REGISTRY.gauge('linkedin_driver_pool_drivers', 'Chrome drivers in the pool by state', ('state',))
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metrics: stage latencies, throughput, cache and outbound request counters"""
+    for state, value in scraper.driver_pool.stats().items():
+        DRIVER_POOL_DRIVERS.set(value, state=state)
+    scraper.rate_limiter.publish_metrics()
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
 @app.route('/authenticate', methods=['POST'])
 def authenticate():
     """Authenticate with LinkedIn"""
@@ -246,7 +653,7 @@ def authenticate():
     if not email or not password:
         return jsonify({"error": "Email and password required"}), 400
     
-    success = scraper.authenticate(email, password)
+    success = scraper.authenticate(email, password, force=bool(data.get('force', False)))
     
     return jsonify({
         "success": success,
@@ -255,13 +662,15 @@ def authenticate():
 
 @app.route('/scrape/<company_name>', methods=['GET'])
 def scrape_company_endpoint(company_name):
-    """Scrape a specific company"""
-    profile = scraper.scrape_company(company_name)
+    """Scrape a specific company, served from the profile cache when possible"""
+    refresh = request.args.get('refresh', 'false').lower() == 'true'
+    profile, cache_status = scraper.get_company_profile(company_name, refresh=refresh)
     
     if profile:
         return jsonify({
             "success": True,
-            "data": asdict(profile)
+            "data": asdict(profile),
+            "cache": cache_status
         })
     else:
         return jsonify({
@@ -271,8 +680,30 @@ def scrape_company_endpoint(company_name):
 
 @app.route('/scrape/all', methods=['GET'])
 def scrape_all_companies_endpoint():
-    """Scrape all portfolio companies"""
-    results = scraper.scrape_all_companies()
+    """Scrape all portfolio companies; ?stream=ndjson|sse sends each profile as it completes"""
+    concurrent = request.args.get('concurrent', 'true').lower() != 'false'
+    max_workers = request.args.get('workers', type=int)
+    
+    format = stream_format(request)
+    if format:
+        def events():
+            scraped = failed = 0
+            for company_name, profile in scraper.iter_scrape_all_companies(max_workers if concurrent else 1):
+                if profile:
+                    scraped += 1
+                else:
+                    failed += 1
+                yield {
+                    "type": "result",
+                    "company": company_name,
+                    "success": profile is not None,
+                    "data": asdict(profile) if profile else None
+                }
+            yield {"type": "done", "count": scraped, "failed": failed}
+        
+        return streaming_response(events(), format)
+    
+    results = scraper.scrape_all_companies(concurrent=concurrent, max_workers=max_workers)
     
     return jsonify({
         "success": True,
@@ -280,6 +711,61 @@ def scrape_all_companies_endpoint():
         "count": len(results)
     })
 
+@app.route('/jobs/scrape_all', methods=['POST'])
+def submit_scrape_all_job():
+    """Start a background scrape of all portfolio companies, or return the one already in progress"""
+    active = job_manager.active('scrape_all')
+    if active:
+        return jsonify({
+            "success": True,
+            "job_id": active["job_id"],
+            "status": active["status"],
+            "reused": True
+        }), 202
+    
+    max_workers = request.args.get('workers', type=int)
+    job = job_manager.submit('scrape_all', run_scrape_all_job, max_workers, params={"workers": max_workers})
+    
+    return jsonify({
+        "success": True,
+        "job_id": job.id,
+        "status": job.status,
+        "reused": False
+    }), 202
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    """List known background jobs"""
+    jobs = job_manager.snapshots()
+    return jsonify({
+        "jobs": jobs,
+        "count": len(jobs)
+    })
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Get status and progress of a background job"""
+    job = job_manager.snapshot(job_id)
+    if not job:
+        return jsonify({"success": False, "error": f"Job {job_id} not found"}), 404
+    
+    return jsonify({
+        "success": True,
+        "job": job
+    })
+
+@app.route('/jobs/<job_id>/results', methods=['GET'])
+def get_job_results(job_id):
+    """Get partial or final results of a background job"""
+    job = job_manager.snapshot(job_id, include_results=True)
+    if not job:
+        return jsonify({"success": False, "error": f"Job {job_id} not found"}), 404
+    
+    return jsonify({
+        "success": True,
+        "job": job
+    })
+
 @app.route('/companies', methods=['GET'])
 def list_companies():
     """List all available portfolio companies"""
@@ -288,9 +774,28 @@ def list_companies():
         "count": len(scraper.portfolio_companies)
     })
 
+@app.route('/companies/resolve', methods=['GET'])
+def resolve_company():
+    """Resolve a free-text company name to a registered portfolio company"""
+    name = request.args.get('name', '')
+    if not name:
+        return jsonify({"success": False, "error": "name parameter required"}), 400
+
+    record = scraper.registry.resolve(name)
+    return jsonify({
+        "success": record is not None,
+        "query": name,
+        "company": asdict(record) if record else None,
+        "candidates": [
+            {"name": candidate.name, "linkedin_url": candidate.linkedin_url, "score": score}
+            for candidate, score in scraper.registry.match(name)
+        ]
+    }), 200 if record else 404
+
 if __name__ == '__main__':
     import atexit
-    atexit.register(scraper.close)
+    atexit.register(shutdown)
     
+    # Development server; run `gunicorn -c gunicorn.conf.py linkedin_scraper_service:app` to use every core
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True) 
\ No newline at end of file
+    app.run(host='0.0.0.0', port=port, debug=os.environ.get('FLASK_DEBUG') == '1') 
\ No newline at end of file
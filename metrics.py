@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Service metrics
+Thread-safe counters, gauges and histograms rendered in the Prometheus text
+format, plus stage timers used to instrument the scraping hot paths.
+"""
+
+import bisect
+import inspect
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; spans sub-millisecond tweet analysis up to multi-minute scrapes
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric(ABC):
+    kind = 'untyped'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Sample lines in the Prometheus text format"""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series[0]) if series else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(counts), total[0]) for key, (counts, total) in self._series.items())
+
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram('scrape_stage_duration_seconds', 'Time spent in each pipeline stage', ('stage',))
+STAGE_ITEMS = REGISTRY.counter('scrape_stage_items_total', 'Items produced by each pipeline stage', ('stage',))
+STAGE_ERRORS = REGISTRY.counter('scrape_stage_errors_total', 'Pipeline stage runs that raised', ('stage',))
+STAGE_THROUGHPUT = REGISTRY.gauge('scrape_stage_items_per_second', 'Throughput of the latest run of each stage', ('stage',))
+CACHE_REQUESTS = REGISTRY.counter('cache_requests_total', 'Cache lookups by cache and result', ('cache', 'result'))
+OUTBOUND_REQUESTS = REGISTRY.counter('outbound_requests_total', 'Outbound requests by host and outcome', ('host', 'outcome'))
+OUTBOUND_RETRIES = REGISTRY.counter('outbound_retries_total', 'Outbound requests re-attempted after a failure', ('host',))
+RATE_LIMIT_WAIT = REGISTRY.histogram('rate_limiter_wait_seconds', 'Time spent waiting for a rate limiter slot', ('host',))
+CIRCUIT_OPEN = REGISTRY.gauge('rate_limiter_circuit_open', '1 while a host circuit breaker is open or half open', ('host',))
+HOST_BACKOFF = REGISTRY.gauge('rate_limiter_backoff_multiplier', 'Current interval multiplier per host', ('host',))
+
+
+class Span:
+    """Timing of one stage run; set items to record throughput"""
+
+    __slots__ = ('stage', 'items', 'start')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.items: Optional[int] = None
+        self.start = time.perf_counter()
+
+    def finish(self):
+        elapsed = time.perf_counter() - self.start
+        STAGE_SECONDS.observe(elapsed, stage=self.stage)
+        if self.items is not None:
+            STAGE_ITEMS.inc(self.items, stage=self.stage)
+            if elapsed > 0:
+                STAGE_THROUGHPUT.set(self.items / elapsed, stage=self.stage)
+        return elapsed
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block as a pipeline stage, counting it as an error if it raises"""
+    span = Span(name)
+    try:
+        yield span
+    except Exception:
+        STAGE_ERRORS.inc(stage=name)
+        raise
+    finally:
+        span.finish()
+
+
+def timed(name: str):
+    """Decorator timing every call of a function (or coroutine function) as a pipeline stage"""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception:
+                    STAGE_ERRORS.inc(stage=name)
+                    raise
+                finally:
+                    STAGE_SECONDS.observe(time.perf_counter() - start, stage=name)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                STAGE_ERRORS.inc(stage=name)
+                raise
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - start, stage=name)
+        return wrapper
+    return decorator
+
+
+def render() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Rate limiting for outbound scrapers
+Token buckets for a global requests-per-second budget and for each host,
+with adaptive backoff when a host errors or throttles (429) and a circuit
+breaker that fails fast on hosts that keep failing. Under several worker
+processes each limiter gets an even share of the configured budget.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional, TypeVar
+from urllib.parse import urlparse
+
+from metrics import CIRCUIT_OPEN as CIRCUIT_OPEN_GAUGE, HOST_BACKOFF, OUTBOUND_REQUESTS, OUTBOUND_RETRIES, RATE_LIMIT_WAIT
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+T = TypeVar('T')
+
+# Status codes that mean "slow down" rather than "broken"
+THROTTLE_STATUSES = {429, 503}
+
+
+def worker_processes() -> int:
+    """Worker processes serving the app (WEB_CONCURRENCY, exported by gunicorn.conf.py)"""
+    try:
+        return max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))
+    except ValueError:
+        return 1
+
+
+def worker_share(total: int) -> int:
+    """This worker's part of a per-service pool size, at least one"""
+    return max(1, total // worker_processes())
+
+
+def domain_of(url: str) -> str:
+    """Return the host part of a URL (or the value itself if it has none)"""
+    netloc = urlparse(url).netloc if "://" in url else url
+    return netloc.lower().split(':')[0]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header given as seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of waiting when a host's circuit breaker is open"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """Token bucket kept as a theoretical arrival time, so slots can be reserved ahead"""
+
+    def __init__(self, interval: float, capacity: int = 1):
+        self.interval = interval
+        self.capacity = max(1, capacity)
+        self._tat = 0.0
+
+    def earliest(self, now: float, interval: Optional[float] = None) -> float:
+        """Earliest time a token is available"""
+        interval = self.interval if interval is None else interval
+        return max(now, self._tat - interval * (self.capacity - 1))
+
+    def take(self, at: float, interval: Optional[float] = None):
+        """Spend a token at the given time"""
+        interval = self.interval if interval is None else interval
+        self._tat = max(self._tat, at) + interval
+
+
+class HostState:
+    """Per-host bucket, backoff multiplier and circuit breaker"""
+
+    def __init__(self, interval: float, burst: int, reset_timeout: float):
+        self.bucket = TokenBucket(interval, burst)
+        self.backoff = 1.0
+        self.blocked_until = 0.0
+        self.circuit = CIRCUIT_CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self.reset_timeout = reset_timeout
+        self.trial_started = 0.0
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "circuit": self.circuit,
+            "consecutive_failures": self.failures,
+            "interval": round(self.bucket.interval * self.backoff, 3),
+            "backoff": round(self.backoff, 2),
+            "blocked_for": round(max(0.0, self.blocked_until - now, self.open_until - now), 1)
+        }
+
+
+class RateLimiter:
+    """Global requests-per-second budget with per-host buckets, backoff and circuit breaking"""
+
+    def __init__(self, requests_per_second: float = 1.0, domain_interval: float = 2.0,
+                 burst: int = 1, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 max_backoff: float = 32.0, processes: int = 1):
+        # Budgets are for the whole service; with N worker processes each one gets 1/N of them
+        processes = max(1, processes)
+        requests_per_second /= processes
+        domain_interval *= processes
+        self.requests_per_second = requests_per_second
+        self.domain_interval = domain_interval
+        self.burst = burst
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        global_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._global = TokenBucket(global_interval, burst)
+        self._hosts: Dict[str, HostState] = {}
+
+    def _host(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostState(self.domain_interval, self.burst, self.reset_timeout)
+            self._hosts[host] = state
+        return state
+
+    def _check_circuit(self, host: str, state: HostState, now: float):
+        """Raise if the circuit rejects a request; lets one trial through after the timeout"""
+        if state.circuit == CIRCUIT_CLOSED:
+            return
+        if state.circuit == CIRCUIT_OPEN:
+            if now < state.open_until:
+                raise CircuitOpenError(host, state.open_until - now)
+            state.circuit = CIRCUIT_HALF_OPEN
+            state.trial_started = now
+            return
+        # Half open: a single trial request is in flight until it reports back
+        if now - state.trial_started < state.reset_timeout:
+            raise CircuitOpenError(host, state.reset_timeout - (now - state.trial_started))
+        state.trial_started = now
+
+    def reserve(self, url: str) -> float:
+        """Reserve the next free slot for a URL and return seconds to wait for it"""
+        host = domain_of(url)
+
+        with self._lock:
+            now = time.monotonic()
+            state = self._host(host)
+            try:
+                self._check_circuit(host, state, now)
+            except CircuitOpenError:
+                OUTBOUND_REQUESTS.inc(host=host, outcome='rejected')
+                raise
+
+            host_interval = state.bucket.interval * state.backoff
+            start = max(
+                self._global.earliest(now),
+                state.bucket.earliest(now, host_interval),
+                state.blocked_until
+            )
+            self._global.take(start)
+            state.bucket.take(start, host_interval)
+
+        return start - now
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to the URL is allowed; returns the time waited"""
+        wait = self.reserve(url)
+        RATE_LIMIT_WAIT.observe(max(wait, 0.0), host=domain_of(url))
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """Like acquire, but waits without blocking the event loop"""
+        wait = self.reserve(url)
+        RATE_LIMIT_WAIT.observe(max(wait, 0.0), host=domain_of(url))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def call_with_retries(self, url: str, fn: Callable[[], T], retries: int = 0) -> T:
+        """Call fn once a request to the URL is allowed, re-attempting failures up to retries times
+
+        Each failure backs the host off, so a retry waits for a longer slot;
+        CircuitOpenError is raised once the host's circuit opens.
+        """
+        for attempt in range(retries + 1):
+            if attempt:
+                self.record_retry(url)
+            self.acquire(url)
+            try:
+                result = fn()
+            except Exception:
+                self.record_failure(url)
+                if attempt == retries:
+                    raise
+                continue
+            self.record_success(url)
+            return result
+
+    def record_retry(self, url: str):
+        """Count a re-attempt of a failed request"""
+        OUTBOUND_RETRIES.inc(host=domain_of(url))
+
+    def record_success(self, url: str):
+        """Close the host's circuit and let its rate recover"""
+        OUTBOUND_REQUESTS.inc(host=domain_of(url), outcome='success')
+        with self._lock:
+            state = self._host(domain_of(url))
+            state.failures = 0
+            state.circuit = CIRCUIT_CLOSED
+            state.reset_timeout = self.reset_timeout
+            state.backoff = max(1.0, state.backoff * 0.75)
+
+    def record_failure(self, url: str, retry_after: Optional[float] = None):
+        """Slow the host down and open its circuit after repeated failures"""
+        host = domain_of(url)
+        OUTBOUND_REQUESTS.inc(host=host, outcome='failure')
+        with self._lock:
+            now = time.monotonic()
+            state = self._host(host)
+            state.failures += 1
+            state.backoff = min(self.max_backoff, state.backoff * 2)
+            if retry_after:
+                state.blocked_until = max(state.blocked_until, now + retry_after)
+
+            if state.circuit == CIRCUIT_HALF_OPEN:
+                # Failed trial: stay open for twice as long next time
+                state.reset_timeout = min(state.reset_timeout * 2, self.reset_timeout * self.max_backoff)
+                state.circuit = CIRCUIT_OPEN
+                state.open_until = now + state.reset_timeout
+            elif state.failures >= self.failure_threshold:
+                state.circuit = CIRCUIT_OPEN
+                state.open_until = now + state.reset_timeout
+
+    def record_throttled(self, url: str, retry_after: Optional[float] = None):
+        """Back off a host that asked us to slow down, without counting it as broken"""
+        OUTBOUND_REQUESTS.inc(host=domain_of(url), outcome='throttled')
+        with self._lock:
+            now = time.monotonic()
+            state = self._host(domain_of(url))
+            state.backoff = min(self.max_backoff, state.backoff * 2)
+            pause = retry_after if retry_after is not None else state.bucket.interval * state.backoff
+            state.blocked_until = max(state.blocked_until, now + pause)
+            if state.circuit == CIRCUIT_HALF_OPEN:
+                state.circuit = CIRCUIT_OPEN
+                state.open_until = state.blocked_until
+
+    def record_response(self, url: str, status_code: int, headers: Optional[Mapping[str, str]] = None):
+        """Feed an HTTP response status back into the host's backoff and circuit state"""
+        if status_code in THROTTLE_STATUSES:
+            self.record_throttled(url, parse_retry_after((headers or {}).get('Retry-After')))
+        elif status_code >= 500:
+            self.record_failure(url)
+        else:
+            self.record_success(url)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Backoff and circuit state per host"""
+        with self._lock:
+            now = time.monotonic()
+            return {host: state.to_dict(now) for host, state in self._hosts.items()}
+
+    def publish_metrics(self):
+        """Export each host's circuit state and backoff as gauges"""
+        for host, state in self.stats().items():
+            CIRCUIT_OPEN_GAUGE.set(0 if state['circuit'] == CIRCUIT_CLOSED else 1, host=host)
+            HOST_BACKOFF.set(state['backoff'], host=host)
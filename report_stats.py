@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Mergeable report aggregates
+Running totals behind a company report's summary stats, sentiment and
+category breakdowns and top keywords. Aggregates are filled from a company's
+TweetBatch and merged across companies for the portfolio-wide sheets.
+"""
+
+import heapq
+from typing import Any, Dict, Iterable, List
+
+from lazy_import import lazy_module
+
+np = lazy_module('numpy')
+
+SENTIMENTS = ('positive', 'negative', 'neutral')
+
+
+def _add_counts(totals: Dict[str, int], counts: Dict[str, int]):
+    for key, count in counts.items():
+        totals[key] = totals.get(key, 0) + count
+
+
+class ReportAggregator:
+    """Counts and sums over analyzed tweets that can be combined with merge()"""
+
+    __slots__ = ('tweets', 'relevance_total', 'high_importance', 'engagement', 'verified', 'followers_total',
+                 'sentiments', 'categories', 'keywords')
+
+    def __init__(self):
+        self.tweets = 0
+        self.relevance_total = 0.0
+        self.high_importance = 0
+        self.engagement = 0
+        self.verified = 0
+        self.followers_total = 0
+        self.sentiments: Dict[str, int] = {sentiment: 0 for sentiment in SENTIMENTS}
+        # Categories and keywords keep first-seen order, which breaks ties in top_keywords
+        self.categories: Dict[str, int] = {}
+        self.keywords: Dict[str, int] = {}
+
+    @classmethod
+    def merged(cls, aggregators: Iterable['ReportAggregator']) -> 'ReportAggregator':
+        total = cls()
+        for aggregator in aggregators:
+            total.merge(aggregator)
+        return total
+
+    def add_batch(self, batch) -> 'ReportAggregator':
+        """Fold in a TweetBatch, reducing each column once"""
+        if not len(batch):
+            return self
+        self.tweets += len(batch)
+        self.relevance_total += float(np.add.reduce(batch.relevance_score))
+        self.high_importance += batch.counts('importance_level').get('high', 0)
+        self.engagement += int(batch.engagement().sum())
+        self.verified += int(np.count_nonzero(batch.is_verified))
+        self.followers_total += int(batch.author_followers.sum())
+        _add_counts(self.sentiments, batch.counts('sentiment'))
+        _add_counts(self.categories, batch.counts('category'))
+        _add_counts(self.keywords, batch.keyword_counts())
+        return self
+
+    def merge(self, other: 'ReportAggregator') -> 'ReportAggregator':
+        self.tweets += other.tweets
+        self.relevance_total += other.relevance_total
+        self.high_importance += other.high_importance
+        self.engagement += other.engagement
+        self.verified += other.verified
+        self.followers_total += other.followers_total
+        _add_counts(self.sentiments, other.sentiments)
+        _add_counts(self.categories, other.categories)
+        _add_counts(self.keywords, other.keywords)
+        return self
+
+    def summary_stats(self) -> Dict[str, Any]:
+        if not self.tweets:
+            return {
+                'average_relevance_score': 0,
+                'high_importance_tweets': 0,
+                'total_engagement': 0,
+                'verified_authors': 0,
+                'avg_author_followers': 0
+            }
+        return {
+            'average_relevance_score': round(self.relevance_total / self.tweets, 2),
+            'high_importance_tweets': self.high_importance,
+            'total_engagement': self.engagement,
+            'verified_authors': self.verified,
+            'avg_author_followers': round(self.followers_total / self.tweets)
+        }
+
+    def sentiment_breakdown(self) -> Dict[str, int]:
+        return dict(self.sentiments)
+
+    def category_breakdown(self) -> Dict[str, int]:
+        return dict(self.categories)
+
+    def top_keywords(self, k: int = 10) -> List[str]:
+        """Most frequent keywords, earliest seen first among equal counts"""
+        top = heapq.nlargest(k, enumerate(self.keywords.items()), key=lambda item: (item[1][1], -item[0]))
+        return [keyword for _, (keyword, _) in top]
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Portfolio report rows and report sinks
+Row builders shared by every report format, a write-only openpyxl workbook
+that appends each company's rows as soon as its analysis finishes, and
+partitioned Parquet/CSV/NDJSON sinks for warehouse loads.
+"""
+
+import csv
+import gzip
+import hashlib
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from lazy_import import is_available, lazy_module
+from metrics import stage
+from report_stats import ReportAggregator
+
+# Writers import their libraries when the first report is written
+openpyxl = lazy_module('openpyxl')
+pa = lazy_module('pyarrow')
+pq = lazy_module('pyarrow.parquet')
+PYARROW_AVAILABLE = is_available('pyarrow')
+
+TWEET_COLUMNS = [
+    'Company', 'Tweet ID', 'Author', 'Author Followers', 'Verified', 'Text', 'Timestamp',
+    'Likes', 'Retweets', 'Replies', 'URL', 'Relevance Score', 'Category', 'Sentiment',
+    'Importance', 'Keywords', 'Summary'
+]
+
+COMPANY_TWEET_COLUMNS = [
+    'Tweet ID', 'Author', 'Verified', 'Text', 'Timestamp', 'Likes', 'Retweets',
+    'Relevance Score', 'Category', 'Sentiment', 'Importance', 'Summary'
+]
+
+SUMMARY_COLUMNS = [
+    'Company', 'Total Tweets', 'Avg Relevance Score', 'High Importance', 'Total Engagement',
+    'Positive Sentiment', 'Negative Sentiment', 'Neutral Sentiment', 'Top Category'
+]
+
+# Typed columns of the exported tweet and summary datasets
+TWEET_FIELDS = [
+    ('company', 'string'), ('tweet_id', 'string'), ('author', 'string'), ('author_followers', 'int64'),
+    ('verified', 'bool'), ('text', 'string'), ('timestamp', 'timestamp'), ('likes', 'int64'),
+    ('retweets', 'int64'), ('replies', 'int64'), ('url', 'string'), ('relevance_score', 'float64'),
+    ('category', 'string'), ('sentiment', 'string'), ('importance', 'string'),
+    ('keywords', 'list<string>'), ('summary', 'string')
+]
+
+SUMMARY_FIELDS = [
+    ('company', 'string'), ('total_tweets', 'int64'), ('avg_relevance_score', 'float64'),
+    ('high_importance', 'int64'), ('total_engagement', 'int64'), ('positive_sentiment', 'int64'),
+    ('negative_sentiment', 'int64'), ('neutral_sentiment', 'int64'), ('top_category', 'string'),
+    ('generated_at', 'timestamp')
+]
+
+INVALID_SHEET_CHARS = re.compile(r'[\[\]:*?/\\]')
+INVALID_PARTITION_CHARS = re.compile(r'[^A-Za-z0-9._-]+')
+
+
+def excel_datetime(value: Any) -> Any:
+    """Excel cannot store timezones, so convert aware datetimes to naive UTC"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def sheet_name(company: str, used: Optional[Set[str]] = None) -> str:
+    """Valid, unique (case-insensitive) worksheet title for a company"""
+    base = INVALID_SHEET_CHARS.sub('', company).strip()[:31] or 'Company'
+    if used is None:
+        return base
+
+    name = base
+    suffix = 1
+    while name.lower() in used:
+        tag = f" ({suffix})"
+        name = base[:31 - len(tag)] + tag
+        suffix += 1
+    used.add(name.lower())
+    return name
+
+
+def tweet_row(company: str, tweet, analysis) -> Dict[str, Any]:
+    return {
+        'Company': company,
+        'Tweet ID': tweet.id,
+        'Author': tweet.author,
+        'Author Followers': tweet.author_followers,
+        'Verified': tweet.is_verified,
+        'Text': tweet.text,
+        'Timestamp': excel_datetime(tweet.timestamp),
+        'Likes': tweet.likes,
+        'Retweets': tweet.retweets,
+        'Replies': tweet.replies,
+        'URL': tweet.url,
+        'Relevance Score': analysis.relevance_score,
+        'Category': analysis.category,
+        'Sentiment': analysis.sentiment,
+        'Importance': analysis.importance_level,
+        'Keywords': ', '.join(analysis.keywords_matched),
+        'Summary': analysis.summary
+    }
+
+
+def company_tweet_row(tweet, analysis) -> Dict[str, Any]:
+    return {
+        'Tweet ID': tweet.id,
+        'Author': tweet.author,
+        'Verified': tweet.is_verified,
+        'Text': tweet.text,
+        'Timestamp': excel_datetime(tweet.timestamp),
+        'Likes': tweet.likes,
+        'Retweets': tweet.retweets,
+        'Relevance Score': analysis.relevance_score,
+        'Category': analysis.category,
+        'Sentiment': analysis.sentiment,
+        'Importance': analysis.importance_level,
+        'Summary': analysis.summary
+    }
+
+
+def summary_row(company: str, report) -> Dict[str, Any]:
+    return {
+        'Company': company,
+        'Total Tweets': report.total_tweets,
+        'Avg Relevance Score': report.summary_stats['average_relevance_score'],
+        'High Importance': report.summary_stats['high_importance_tweets'],
+        'Total Engagement': report.summary_stats['total_engagement'],
+        'Positive Sentiment': report.sentiment_breakdown['positive'],
+        'Negative Sentiment': report.sentiment_breakdown['negative'],
+        'Neutral Sentiment': report.sentiment_breakdown['neutral'],
+        'Top Category': max(report.category_breakdown.items(), key=lambda x: x[1])[0] if report.category_breakdown else 'None'
+    }
+
+
+def tweet_record(company: str, tweet, analysis) -> Dict[str, Any]:
+    """Typed (snake_case) tweet row for columnar exports"""
+    timestamp = tweet.timestamp
+    if isinstance(timestamp, datetime) and timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return {
+        'company': company,
+        'tweet_id': str(tweet.id),
+        'author': tweet.author,
+        'author_followers': int(tweet.author_followers),
+        'verified': bool(tweet.is_verified),
+        'text': tweet.text,
+        'timestamp': timestamp,
+        'likes': int(tweet.likes),
+        'retweets': int(tweet.retweets),
+        'replies': int(tweet.replies),
+        'url': tweet.url,
+        'relevance_score': float(analysis.relevance_score),
+        'category': analysis.category,
+        'sentiment': analysis.sentiment,
+        'importance': analysis.importance_level,
+        'keywords': list(analysis.keywords_matched),
+        'summary': analysis.summary
+    }
+
+
+def partition_value(value: str) -> str:
+    """Path-safe partition value: a readable slug plus a short hash of the raw value
+
+    The hash keeps names that only differ in punctuation or case (e.g.
+    "Acme, Inc." and "Acme Inc") in separate partitions, including on
+    case-insensitive filesystems.
+    """
+    slug = INVALID_PARTITION_CHARS.sub('_', value).strip('_') or 'unknown'
+    return f"{slug}-{hashlib.sha1(value.encode('utf-8')).hexdigest()[:8]}"
+
+
+class ReportSink(ABC):
+    """Destination for the portfolio report, fed one company at a time"""
+
+    @abstractmethod
+    def add_company(self, company: str, report):
+        """Write one company's analysed tweets and summary"""
+
+    @abstractmethod
+    def close(self) -> List[str]:
+        """Finish writing and return the paths produced"""
+
+
+class ExcelReportWriter(ReportSink):
+    """Constant-memory workbook writer for the portfolio report.
+
+    Produces the same sheets as the buffered pandas export, and writes every
+    tweet row as soon as its company is added. The summary, company sheets
+    and breakdown totals follow company_order, and company sheet titles are
+    assigned from it up front, so they do not depend on completion order.
+    "All Tweets" lists each company's tweets by descending relevance, like
+    the buffered export, but companies appear in completion order rather
+    than alphabetically; sort on the Company column when reading it. The
+    sheet is left out when there are no tweets.
+    """
+
+    def __init__(self, path: str, company_order: Optional[List[str]] = None):
+        self.path = path
+        self.company_order = {company: i for i, company in enumerate(company_order or [])}
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self._used_names: Set[str] = {'portfolio summary', 'all tweets', 'overall sentiment', 'overall categories'}
+        self._summary_sheet = self.workbook.create_sheet('Portfolio Summary')
+        self._summary_sheet.append(SUMMARY_COLUMNS)
+        # Created with the first tweet, then moved into place by close()
+        self._all_tweets_sheet = None
+        self._sheet_names = {company: sheet_name(company, self._used_names) for company in self.company_order}
+        self._company_sheets: Dict[str, Any] = {}
+        self._summary_rows: List[Dict[str, Any]] = []
+        self._aggregates: Dict[str, ReportAggregator] = {}
+        self.companies_written = 0
+        self.tweets_written = 0
+
+    def add_company(self, company: str, report):
+        """Append one company's tweets and keep its breakdowns for the totals"""
+        with stage('report_write_xlsx') as span:
+            company_sheet = None
+            if report.tweets:
+                title = self._sheet_names.get(company) or sheet_name(company, self._used_names)
+                company_sheet = self.workbook.create_sheet(title)
+                company_sheet.append(COMPANY_TWEET_COLUMNS)
+                self._company_sheets[company] = company_sheet
+
+            rows = []
+            for tweet, analysis in zip(report.tweets, report.analyses):
+                rows.append(tweet_row(company, tweet, analysis))
+                company_row = company_tweet_row(tweet, analysis)
+                company_sheet.append([company_row[column] for column in COMPANY_TWEET_COLUMNS])
+                self.tweets_written += 1
+            rows.sort(key=lambda row: row['Relevance Score'], reverse=True)
+            if rows and self._all_tweets_sheet is None:
+                self._all_tweets_sheet = self.workbook.create_sheet('All Tweets')
+                self._all_tweets_sheet.append(TWEET_COLUMNS)
+            for row in rows:
+                self._all_tweets_sheet.append([row[column] for column in TWEET_COLUMNS])
+
+            self._summary_rows.append(summary_row(company, report))
+            self._aggregates[company] = report.aggregate
+            self.companies_written += 1
+            span.items = len(report.tweets)
+
+    def close(self) -> List[str]:
+        """Write the summary and breakdown sheets and save the workbook"""
+        with stage('report_close_xlsx'):
+            def position(company):
+                return self.company_order.get(company, len(self.company_order))
+
+            self._summary_rows.sort(key=lambda row: position(row['Company']))
+            for row in self._summary_rows:
+                self._summary_sheet.append([row[column] for column in SUMMARY_COLUMNS])
+
+            sentiment_sheet = self.workbook.create_sheet('Overall Sentiment')
+            sentiment_sheet.append(['Sentiment', 'Count'])
+            # Merged in company order, which decides the order of the breakdown rows
+            totals = ReportAggregator.merged(self._aggregates[company] for company in sorted(self._aggregates, key=position))
+            for sentiment, count in totals.sentiment_breakdown().items():
+                sentiment_sheet.append([sentiment, count])
+
+            overall_categories = totals.category_breakdown()
+            categories_sheet = None
+            if overall_categories:
+                categories_sheet = self.workbook.create_sheet('Overall Categories')
+                categories_sheet.append(['Category', 'Count'])
+                for category, count in overall_categories.items():
+                    categories_sheet.append([category, count])
+
+            company_sheets = [self._company_sheets[company] for company in sorted(self._company_sheets, key=position)]
+            sheets = [self._summary_sheet, self._all_tweets_sheet, *company_sheets, sentiment_sheet, categories_sheet]
+            for index, sheet in enumerate(sheet for sheet in sheets if sheet is not None):
+                self.workbook.move_sheet(sheet.title, index - self.workbook.index(sheet))
+
+            self.workbook.save(self.path)
+            return [self.path]
+
+
+class PartitionedDatasetSink(ReportSink):
+    """Columnar export of tweets partitioned by company and date.
+
+    Files are laid out Hive-style so warehouse loads can append a run
+    without rewriting earlier ones:
+
+        <root>/<format>/tweets/company=<company>-<hash>/date=<YYYY-MM-DD>/part-<run_id>.<ext>
+        <root>/<format>/portfolio_summary/date=<YYYY-MM-DD>/part-<run_id>.<ext>
+
+    The company partition is a slug of the name plus a short hash of it (see
+    partition_value); the exact name is in each record's company column.
+    Supported formats are 'parquet' (requires pyarrow), 'csv' and 'ndjson';
+    CSV and NDJSON are gzip-compressed and described by a _schema.json file.
+    """
+
+    EXTENSIONS = {'parquet': 'parquet', 'csv': 'csv.gz', 'ndjson': 'ndjson.gz'}
+
+    def __init__(self, root: str, format: str = 'parquet', run_id: Optional[str] = None):
+        if format not in self.EXTENSIONS:
+            raise ValueError(f"Unsupported export format: {format}")
+        if format == 'parquet' and not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow not available - install with: pip install pyarrow")
+
+        self.root = root
+        self.format = format
+        self.generated_at = datetime.now(timezone.utc)
+        self.run_id = run_id or self.generated_at.strftime('%Y%m%d_%H%M%S')
+        self._summary_records: List[Dict[str, Any]] = []
+        self.paths: List[str] = []
+
+    def add_company(self, company: str, report):
+        with stage(f'report_write_{self.format}') as span:
+            partitions: Dict[str, List[Dict[str, Any]]] = {}
+            for tweet, analysis in zip(report.tweets, report.analyses):
+                record = tweet_record(company, tweet, analysis)
+                date = record['timestamp'].strftime('%Y-%m-%d') if isinstance(record['timestamp'], datetime) else 'unknown'
+                partitions.setdefault(date, []).append(record)
+
+            for date, records in partitions.items():
+                directory = os.path.join(self.root, self.format, 'tweets', f"company={partition_value(company)}", f"date={date}")
+                self._write(directory, records, TWEET_FIELDS)
+
+            row = summary_row(company, report)
+            self._summary_records.append({
+                'company': company,
+                'total_tweets': int(row['Total Tweets']),
+                'avg_relevance_score': float(row['Avg Relevance Score']),
+                'high_importance': int(row['High Importance']),
+                'total_engagement': int(row['Total Engagement']),
+                'positive_sentiment': int(row['Positive Sentiment']),
+                'negative_sentiment': int(row['Negative Sentiment']),
+                'neutral_sentiment': int(row['Neutral Sentiment']),
+                'top_category': row['Top Category'],
+                'generated_at': self.generated_at
+            })
+            span.items = len(report.tweets)
+
+    def close(self) -> List[str]:
+        with stage(f'report_close_{self.format}'):
+            if self._summary_records:
+                directory = os.path.join(self.root, self.format, 'portfolio_summary', f"date={self.generated_at.strftime('%Y-%m-%d')}")
+                self._write(directory, self._summary_records, SUMMARY_FIELDS)
+            self._write_schema('tweets', TWEET_FIELDS)
+            self._write_schema('portfolio_summary', SUMMARY_FIELDS)
+            return list(self.paths)
+
+    def _write(self, directory: str, records: List[Dict[str, Any]], fields):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{self.run_id}.{self.EXTENSIONS[self.format]}")
+
+        if self.format == 'parquet':
+            pq.write_table(pa.Table.from_pylist(records, schema=self._arrow_schema(fields)), path)
+        elif self.format == 'csv':
+            with gzip.open(path, 'wt', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow([name for name, _ in fields])
+                for record in records:
+                    writer.writerow([self._text_value(record[name], kind) for name, kind in fields])
+        else:
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps({name: self._json_value(record[name], kind) for name, kind in fields}))
+                    f.write('\n')
+
+        self.paths.append(path)
+
+    def _write_schema(self, dataset: str, fields):
+        if self.format == 'parquet':
+            return
+        directory = os.path.join(self.root, self.format, dataset)
+        if not os.path.isdir(directory):
+            return
+        with open(os.path.join(directory, '_schema.json'), 'w') as f:
+            json.dump({'format': self.format, 'compression': 'gzip', 'fields': [
+                {'name': name, 'type': kind} for name, kind in fields
+            ]}, f, indent=2)
+
+    @staticmethod
+    def _arrow_schema(fields):
+        types = {
+            'string': pa.string(),
+            'int64': pa.int64(),
+            'float64': pa.float64(),
+            'bool': pa.bool_(),
+            'timestamp': pa.timestamp('us', tz='UTC'),
+            'list<string>': pa.list_(pa.string())
+        }
+        return pa.schema([(name, types[kind]) for name, kind in fields])
+
+    @staticmethod
+    def _json_value(value, kind):
+        if kind == 'timestamp' and isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _text_value(value, kind):
+        if kind == 'timestamp' and isinstance(value, datetime):
+            return value.isoformat()
+        if kind == 'list<string>':
+            return '|'.join(value)
+        return value
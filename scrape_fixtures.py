@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Record/replay fixtures for the scrapers
+Captures Twitter search results, VC page responses and LinkedIn company
+fields to a directory and replays them, so the pipelines and benchmarks run
+without network access. Enabled with SCRAPE_FIXTURES_MODE=record|replay and
+SCRAPE_FIXTURES_DIR. The requests transport adapters that record and replay
+VC pages live in fixture_adapters, so importing this module stays cheap.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+# linkedin_scraper Company attributes read by the LinkedIn service
+COMPANY_FIELDS = ('name', 'about_us', 'website', 'headquarters', 'founded', 'company_type',
+                  'company_size', 'specialties')
+
+# Date-window operators change on every run, so they are not part of a search's fixture key
+_SEARCH_WINDOW = re.compile(r'\s+(?:since|until|since_id):\S+')
+_SLUG = re.compile(r'[^a-z0-9]+')
+
+
+def fixture_key(value: str) -> str:
+    """Readable, filesystem-safe key for a URL or query"""
+    slug = _SLUG.sub('-', value.lower()).strip('-')[:48]
+    return f"{slug}-{hashlib.sha1(value.encode('utf-8')).hexdigest()[:12]}"
+
+
+def search_key(query: str) -> str:
+    return _SEARCH_WINDOW.sub('', query).strip()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class FixtureStore:
+    """Directory of recorded searches, pages and company profiles"""
+
+    def __init__(self, root: str, mode: str = MODE_REPLAY):
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        self.root = root
+        self.mode = mode
+        self._lock = threading.Lock()
+        for kind in ('tweets', 'pages', 'companies'):
+            os.makedirs(os.path.join(root, kind), exist_ok=True)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == MODE_RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    def _path(self, kind: str, key: str, ext: str) -> str:
+        return os.path.join(self.root, kind, f"{fixture_key(key)}.{ext}")
+
+    def _write_json(self, path: str, payload: Any):
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, default=_json_default)
+            os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_json(path: str) -> Optional[Any]:
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    # Twitter searches: one JSON lines file per query
+
+    def save_tweets(self, query: str, tweets: Iterable[Any]):
+        path = self._path('tweets', search_key(query), 'jsonl')
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for tweet in tweets:
+                    row = asdict(tweet) if is_dataclass(tweet) else tweet
+                    f.write(json.dumps(row, default=_json_default) + '\n')
+            os.replace(tmp_path, path)
+
+    def load_tweets(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            with open(self._path('tweets', search_key(query), 'jsonl'), encoding='utf-8') as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return None
+
+    def record_search(self, query: str, tweets: Iterable[Any]) -> Iterator[Any]:
+        """Pass tweets through, saving whatever the caller consumed once it stops"""
+        consumed = []
+        try:
+            for tweet in tweets:
+                consumed.append(tweet)
+                yield tweet
+        finally:
+            self.save_tweets(query, consumed)
+
+    # VC pages: body plus a JSON sidecar with status and headers
+
+    def save_page(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        path = self._path('pages', url, 'html')
+        with self._lock:
+            with open(path, 'wb') as f:
+                f.write(content)
+        self._write_json(f"{path}.json", {'url': url, 'status_code': status_code, 'headers': dict(headers)})
+
+    def load_page(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        path = self._path('pages', url, 'html')
+        meta = self._read_json(f"{path}.json")
+        if meta is None:
+            return None
+        with open(path, 'rb') as f:
+            return meta['status_code'], meta['headers'], f.read()
+
+    # LinkedIn companies: the Company attributes the service reads
+
+    def save_company(self, linkedin_url: str, fields: Dict[str, Any]):
+        self._write_json(self._path('companies', linkedin_url, 'json'), fields)
+
+    def load_company(self, linkedin_url: str) -> Optional[Dict[str, Any]]:
+        return self._read_json(self._path('companies', linkedin_url, 'json'))
+
+
+def fixtures_from_env() -> Optional[FixtureStore]:
+    """Fixture store configured by SCRAPE_FIXTURES_MODE / SCRAPE_FIXTURES_DIR, if any"""
+    mode = os.environ.get('SCRAPE_FIXTURES_MODE', '').strip().lower()
+    if not mode:
+        return None
+    return FixtureStore(os.environ.get('SCRAPE_FIXTURES_DIR', 'scrape_fixtures'), mode)
+
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Background job subsystem for long-running crawls
+Jobs run on a bounded executor; callers poll status, partial results and
+final artifacts by job id instead of holding an HTTP request open. With a
+shared store, snapshots are persisted so any worker process can answer a poll.
+"""
+
+import logging
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+
+
+class Job:
+    """State of a single background job, updated by the job function as it runs"""
+
+    def __init__(self, kind: str, params: Optional[Dict[str, Any]] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params or {}
+        self.status = JOB_QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.total: Optional[int] = None
+        self.completed = 0
+        self.results: Dict[str, Any] = {}
+        self.result: Any = None
+        self.artifacts: List[str] = []
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()
+        # Called after every progress update, e.g. to persist a snapshot
+        self.on_change: Optional[Callable[['Job'], None]] = None
+
+    def set_total(self, total: int):
+        with self._lock:
+            self.total = total
+        self._changed()
+
+    def add_result(self, key: str, value: Any):
+        """Record a partial result and advance progress by one item"""
+        with self._lock:
+            self.results[key] = value
+            self.completed += 1
+        self._changed()
+
+    def advance(self, count: int = 1):
+        with self._lock:
+            self.completed += count
+        self._changed()
+
+    def add_artifact(self, path: str):
+        with self._lock:
+            self.artifacts.append(path)
+        self._changed()
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change(self)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    def to_dict(self, include_results: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            data = {
+                "job_id": self.id,
+                "kind": self.kind,
+                "params": self.params,
+                "status": self.status,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "progress": {
+                    "completed": self.completed,
+                    "total": self.total
+                },
+                "artifacts": list(self.artifacts),
+                "error": self.error
+            }
+            if include_results:
+                data["results"] = dict(self.results)
+                data["result"] = self.result
+        return data
+
+
+class JobManager:
+    """Runs jobs on a background executor with a concurrency limit
+
+    With a store (see shared_state.SharedState) every job is also saved as a
+    snapshot, at most every persist_interval seconds while it runs and once
+    when it finishes, so workers other than the one running it can report on it.
+    A heartbeat thread refreshes the snapshots of unfinished jobs every
+    heartbeat_interval seconds; a job whose worker has exited, or whose
+    heartbeat is older than stale_after seconds, is marked failed when read.
+    """
+
+    def __init__(self, max_concurrent_jobs: int = 1, max_retained_jobs: int = 100,
+                 store=None, persist_interval: float = 1.0, heartbeat_interval: float = 10.0,
+                 stale_after: float = 60.0):
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        self.max_retained_jobs = max_retained_jobs
+        self.store = store
+        self.persist_interval = persist_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_jobs, thread_name_prefix="scrape-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._persisted_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        if self.store:
+            threading.Thread(target=self._heartbeat, name="scrape-job-heartbeat", daemon=True).start()
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args, params: Optional[Dict[str, Any]] = None, **kwargs) -> Job:
+        """Queue fn(job, *args, **kwargs) and return its Job immediately"""
+        job = Job(kind, params)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        if self.store:
+            job.on_change = self._persist
+            self._persist(job, force=True)
+            self.store.prune_jobs(self.max_retained_jobs)
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        logger.info(f"Queued {kind} job {job.id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def snapshot(self, job_id: str, include_results: bool = False) -> Optional[Dict[str, Any]]:
+        """Job state as a dict, from this process or from the shared store"""
+        job = self.get(job_id)
+        if job:
+            return job.to_dict(include_results=include_results)
+        if not self.store:
+            return None
+        self._fail_orphaned_jobs()
+        data = self.store.load_job(job_id)
+        if data and not include_results:
+            data.pop("results", None)
+            data.pop("result", None)
+        return data
+
+    def active(self, kind: str) -> Optional[Dict[str, Any]]:
+        """Most recently created queued or running job of a kind, from any worker"""
+        for data in reversed(self.snapshots()):
+            if data["kind"] == kind and data["status"] in (JOB_QUEUED, JOB_RUNNING):
+                return data
+        return None
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        """All retained jobs, oldest first; local jobs are more current than their stored snapshots"""
+        local = {job.id: job.to_dict() for job in self.list_jobs()}
+        if not self.store:
+            return list(local.values())
+        self._fail_orphaned_jobs()
+        merged = {}
+        for data in self.store.list_jobs(self.max_retained_jobs):
+            data.pop("results", None)
+            data.pop("result", None)
+            merged[data["job_id"]] = local.pop(data["job_id"], data)
+        merged.update(local)
+        return sorted(merged.values(), key=lambda data: data["created_at"])
+
+    def shutdown(self, wait: bool = False):
+        """Stop the executor; without wait, jobs still unfinished are recorded as failed"""
+        self._stopped.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        for job in self.list_jobs():
+            if job.finished:
+                continue
+            job.error = "Worker shut down before the job finished"
+            job.status = JOB_FAILED
+            job.finished_at = time.time()
+            if self.store:
+                self._persist(job, force=True)
+
+    def _run(self, job: Job, fn: Callable[..., Any], args, kwargs):
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        if self.store:
+            self._persist(job, force=True)
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = JOB_COMPLETED
+            logger.info(f"Job {job.id} completed")
+        except Exception as e:
+            job.error = str(e)
+            job.status = JOB_FAILED
+            logger.error(f"Job {job.id} failed: {e}\n{traceback.format_exc()}")
+        finally:
+            job.finished_at = time.time()
+            if self.store:
+                self._persist(job, force=True)
+
+    def _persist(self, job: Job, force: bool = False):
+        """Save a job snapshot to the store, throttled to one write per persist_interval"""
+        now = time.monotonic()
+        with self._lock:
+            last = self._persisted_at.get(job.id)
+            if not force and last is not None and now - last < self.persist_interval:
+                return
+            self._persisted_at[job.id] = now
+        try:
+            self.store.save_job(job.to_dict(include_results=True))
+        except Exception as e:
+            logger.warning(f"Failed to persist job {job.id}: {e}")
+
+    def _unfinished_ids(self) -> List[str]:
+        return [job.id for job in self.list_jobs() if not job.finished]
+
+    def _heartbeat(self):
+        while not self._stopped.wait(self.heartbeat_interval):
+            try:
+                self.store.touch_jobs(self._unfinished_ids())
+            except Exception as e:
+                logger.warning(f"Failed to refresh job heartbeats: {e}")
+
+    def _fail_orphaned_jobs(self):
+        try:
+            for job_id in self.store.fail_orphaned_jobs(self.stale_after, exclude=self._unfinished_ids()):
+                logger.warning(f"Job {job_id} marked failed: its worker is gone")
+        except Exception as e:
+            logger.warning(f"Failed to check for orphaned jobs: {e}")
+
+    def _prune(self):
+        """Drop the oldest finished jobs once more than max_retained_jobs are kept"""
+        excess = len(self._jobs) - self.max_retained_jobs
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:excess]:
+            del self._jobs[job_id]
+            self._persisted_at.pop(job_id, None)
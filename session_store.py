@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Encrypted LinkedIn session store
+Persists the cookies and local storage of an authenticated browser session
+to an encrypted file, so new drivers and restarted processes can reuse the
+login instead of signing in again.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, ContextManager, Dict, List, Optional, Tuple
+
+from shared_state import file_lock
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Cookie that carries the LinkedIn login; its expiry bounds the whole session
+AUTH_COOKIE = 'li_at'
+
+# URL fragments LinkedIn redirects to once a session is no longer valid
+LOGGED_OUT_MARKERS = ('/login', '/authwall', '/checkpoint', '/uas/login')
+
+READ_LOCAL_STORAGE_SCRIPT = "return Object.assign({}, window.localStorage);"
+WRITE_LOCAL_STORAGE_SCRIPT = (
+    "const items = arguments[0];"
+    "for (const key in items) { window.localStorage.setItem(key, items[key]); }"
+)
+
+
+def is_logged_out_url(url: Optional[str]) -> bool:
+    """Whether a browser URL shows LinkedIn bounced us to a login page"""
+    return bool(url) and any(marker in url for marker in LOGGED_OUT_MARKERS)
+
+
+@dataclass
+class BrowserSession:
+    """Cookies and local storage captured from an authenticated driver"""
+    cookies: List[Dict[str, Any]]
+    local_storage: Dict[str, str] = field(default_factory=dict)
+    saved_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def capture(cls, driver) -> 'BrowserSession':
+        """Snapshot the session of a driver that is on a LinkedIn page"""
+        return cls(cookies=driver.get_cookies(), local_storage=driver.execute_script(READ_LOCAL_STORAGE_SCRIPT) or {})
+
+    @property
+    def expires_at(self) -> Optional[float]:
+        """Expiry of the auth cookie, or None when it is a session cookie or missing"""
+        for cookie in self.cookies:
+            if cookie.get('name') == AUTH_COOKIE and cookie.get('expiry'):
+                return float(cookie['expiry'])
+        return None
+
+    @property
+    def is_expired(self) -> bool:
+        if not any(cookie.get('name') == AUTH_COOKIE for cookie in self.cookies):
+            return True
+        expires_at = self.expires_at
+        return expires_at is not None and time.time() >= expires_at
+
+
+class SessionStore:
+    """Fernet-encrypted file holding one browser session"""
+
+    def __init__(self, path: str, key: bytes):
+        if not CRYPTOGRAPHY_AVAILABLE:
+            raise RuntimeError("cryptography not available - install with: pip install cryptography")
+        self.path = path
+        self._fernet = Fernet(key)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional['SessionStore']:
+        """Store configured by LINKEDIN_SESSION_PATH and LINKEDIN_SESSION_KEY, or None if disabled
+
+        LINKEDIN_SESSION_KEY may be a Fernet key or any passphrase. Without it a
+        key is generated once and kept next to the session file
+        (LINKEDIN_SESSION_KEY_PATH) with owner-only permissions. Set
+        LINKEDIN_SESSION_PATH to an empty string to disable persistence.
+        """
+        path = os.environ.get('LINKEDIN_SESSION_PATH', 'linkedin_session.enc')
+        if not path:
+            return None
+        if not CRYPTOGRAPHY_AVAILABLE:
+            logger.warning("cryptography not installed; LinkedIn sessions will not be persisted")
+            return None
+
+        secret = os.environ.get('LINKEDIN_SESSION_KEY')
+        if secret:
+            return cls(path, fernet_key(secret))
+        return cls(path, load_or_create_key(os.environ.get('LINKEDIN_SESSION_KEY_PATH', path + '.key')))
+
+    def load(self) -> Optional[BrowserSession]:
+        """Decrypt the stored session, or None if there is none or it cannot be read"""
+        with self._lock:
+            try:
+                with open(self.path, 'rb') as f:
+                    token = f.read()
+            except FileNotFoundError:
+                return None
+
+        try:
+            data = json.loads(self._fernet.decrypt(token))
+            return BrowserSession(**data)
+        except (InvalidToken, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable LinkedIn session file {self.path}: {e}")
+            return None
+
+    def save(self, session: BrowserSession):
+        """Encrypt and atomically replace the stored session"""
+        token = self._fernet.encrypt(json.dumps(asdict(session)).encode())
+        with self._lock:
+            _write_private(self.path, token)
+
+    def clear(self):
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def version(self) -> Optional[Tuple[int, int]]:
+        """Identity of the session file, which changes whenever any process saves or clears it"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def lock(self) -> ContextManager[None]:
+        """Lock held across worker processes while one of them logs in"""
+        return file_lock(self.path + '.lock')
+
+
+def load_or_create_key(path: str) -> bytes:
+    """Read a Fernet key from path, generating it on first use"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        pass
+
+    key = Fernet.generate_key()
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    try:
+        # Publishes the complete key under path unless another process already has;
+        # unlike os.replace, a slower process cannot swap in a second key
+        os.link(tmp_path, path)
+    except FileExistsError:
+        with open(path, 'rb') as f:
+            return f.read().strip()
+    finally:
+        os.unlink(tmp_path)
+    logger.info(f"Generated LinkedIn session key at {path}")
+    return key
+
+
+def _write_private(path: str, data: bytes):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def fernet_key(secret: str) -> bytes:
+    """Use secret as a Fernet key if it is one, otherwise derive a key from it as a passphrase"""
+    try:
+        Fernet(secret.encode())
+        return secret.encode()
+    except ValueError:
+        digest = hashlib.pbkdf2_hmac('sha256', secret.encode(), b'linkedin-session', 200_000)
+        return base64.urlsafe_b64encode(digest)
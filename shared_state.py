@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+State shared across worker processes
+When a service runs under several gunicorn workers, anything a request can
+change must be visible to the other workers: the VC URL registry and
+background job snapshots live in SQLite, and one-at-a-time work such as a
+LinkedIn login is serialized with a file lock. Each job snapshot records the
+pid of the worker running it and a heartbeat, so a job whose worker died is
+reported as failed instead of running forever.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from scrape_jobs import JOB_COMPLETED, JOB_FAILED
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+FINISHED_STATUSES = (JOB_COMPLETED, JOB_FAILED)
+
+
+def pid_alive(pid: Optional[int]) -> bool:
+    """Whether a process with this pid exists on this host"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on path across processes (and threads) for the with block
+
+    Without fcntl (Windows) this only creates the lock file; run a single worker there.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class SharedState:
+    """SQLite-backed VC URL registry and job snapshots, safe to open from every worker
+
+    The file is created on first use; default_vc_urls are registered then.
+    """
+
+    def __init__(self, path: str, default_vc_urls: Iterable[str] = ()):
+        self.path = path
+        self.default_vc_urls = list(default_vc_urls)
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Connection to the store, opened (creating the file) on first use"""
+        if self._connection is None:
+            with self._connect_lock:
+                if self._connection is None:
+                    self._connection = self._connect()
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS vc_urls (
+                url TEXT PRIMARY KEY,
+                added_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                data TEXT NOT NULL,
+                owner_pid INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at);
+        """)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        if 'owner_pid' not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN owner_pid INTEGER")
+        now = time.time()
+        conn.executemany(
+            "INSERT OR IGNORE INTO vc_urls (url, added_at) VALUES (?, ?)",
+            [(url, now) for url in self.default_vc_urls]
+        )
+        conn.commit()
+        return conn
+
+    def vc_urls(self) -> List[str]:
+        """Registered VC URLs in the order they were added"""
+        with self._lock:
+            rows = self._conn.execute("SELECT url FROM vc_urls ORDER BY rowid").fetchall()
+        return [row[0] for row in rows]
+
+    def add_vc_url(self, url: str) -> bool:
+        """Register a VC URL; False if it is already registered"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO vc_urls (url, added_at) VALUES (?, ?)", (url, time.time())
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def save_job(self, snapshot: Dict[str, Any], owner_pid: Optional[int] = None):
+        """Upsert a job snapshot as produced by Job.to_dict(include_results=True)
+
+        updated_at doubles as the owner's heartbeat; see touch_jobs.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, kind, status, created_at, updated_at, data, owner_pid) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (snapshot['job_id'], snapshot['kind'], snapshot['status'], snapshot['created_at'], time.time(),
+                 json.dumps(snapshot, default=str), owner_pid or os.getpid())
+            )
+            self._conn.commit()
+
+    def touch_jobs(self, job_ids: Iterable[str]):
+        """Refresh the heartbeat of jobs this worker is still running"""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany("UPDATE jobs SET updated_at = ? WHERE id = ?", [(now, job_id) for job_id in job_ids])
+            self._conn.commit()
+
+    def fail_orphaned_jobs(self, stale_after: float, exclude: Iterable[str] = ()) -> List[str]:
+        """Mark unfinished jobs failed when their worker has exited or stopped sending heartbeats
+
+        Jobs in exclude (those the calling worker is running) are left alone.
+        Returns the ids of the jobs marked failed.
+        """
+        exclude = set(exclude)
+        placeholders = ', '.join('?' for _ in FINISHED_STATUSES)
+        now = time.time()
+        failed = []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, updated_at, owner_pid, data FROM jobs WHERE status NOT IN ({placeholders})",
+                FINISHED_STATUSES
+            ).fetchall()
+            for job_id, updated_at, owner_pid, data in rows:
+                if job_id in exclude:
+                    continue
+                if pid_alive(owner_pid) and now - updated_at <= stale_after:
+                    continue
+                snapshot = json.loads(data)
+                snapshot.update({
+                    "status": JOB_FAILED,
+                    "finished_at": now,
+                    "error": f"Worker process {owner_pid} stopped before the job finished"
+                })
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ?, data = ? WHERE id = ?",
+                    (JOB_FAILED, now, json.dumps(snapshot, default=str), job_id)
+                )
+                failed.append(job_id)
+            self._conn.commit()
+        return failed
+
+    def load_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_jobs(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recently created job snapshots, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    def prune_jobs(self, keep: int):
+        """Delete finished jobs beyond the keep most recently created"""
+        placeholders = ', '.join('?' for _ in FINISHED_STATUSES)
+        with self._lock:
+            self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({placeholders}) AND id NOT IN "
+                "(SELECT id FROM jobs ORDER BY created_at DESC LIMIT ?)",
+                (*FINISHED_STATUSES, keep)
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
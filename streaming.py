@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Streaming responses for bulk endpoints
+Turns an iterator of result dicts into an NDJSON or server-sent events
+response that is flushed item by item, so clients see each company as soon
+as it is ready.
+"""
+
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, Optional
+
+from flask import Response, stream_with_context
+
+NDJSON = 'ndjson'
+SSE = 'sse'
+
+MIMETYPES = {NDJSON: 'application/x-ndjson', SSE: 'text/event-stream'}
+
+# X-Accel-Buffering stops reverse proxies such as nginx from buffering the stream
+STREAM_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+
+def stream_format(request) -> Optional[str]:
+    """Requested streaming format from ?stream= or the Accept header, None for a plain JSON body"""
+    requested = request.args.get('stream', '').lower()
+    if requested in ('1', 'true', NDJSON):
+        return NDJSON
+    if requested == SSE:
+        return SSE
+    if requested in ('0', 'false'):
+        return None
+
+    accept = request.headers.get('Accept', '')
+    if MIMETYPES[SSE] in accept:
+        return SSE
+    if MIMETYPES[NDJSON] in accept:
+        return NDJSON
+    return None
+
+
+def encode_event(event: Dict[str, Any], format: str) -> str:
+    """Serialize one event; the dict's 'type' doubles as the SSE event name"""
+    payload = json.dumps(event, default=str)
+    if format == SSE:
+        return f"event: {event.get('type', 'message')}\ndata: {payload}\n\n"
+    return payload + '\n'
+
+
+def encode_events(events: Iterable[Dict[str, Any]], format: str) -> Iterator[str]:
+    for event in events:
+        yield encode_event(event, format)
+
+
+async def encode_events_async(events: AsyncIterable[Dict[str, Any]], format: str) -> AsyncIterator[str]:
+    """encode_events for the async service, whose event sources are async generators"""
+    async for event in events:
+        yield encode_event(event, format)
+
+
+def streaming_response(events: Iterable[Dict[str, Any]], format: str) -> Response:
+    """Flask response that writes each event as soon as the iterator produces it"""
+    response = Response(stream_with_context(encode_events(events, format)), mimetype=MIMETYPES[format])
+    response.headers.update(STREAM_HEADERS)
+    return response
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the scraper services
+Replays recorded fixtures through tweet analysis, company reports, the VC
+page parsers and the report writers at increasing data sizes, recording
+throughput (items/s) and peak traced memory in each benchmark's extra_info.
+
+Fixtures come from SCRAPE_FIXTURES_DIR when set (record them by running the
+services with SCRAPE_FIXTURES_MODE=record); otherwise a synthetic fixture set
+is generated. Recorded tweets and pages are repeated to reach each size.
+
+Usage:
+    pytest test_benchmarks.py --benchmark-autosave
+    pytest test_benchmarks.py --benchmark-compare --benchmark-compare-fail=mean:20%
+    BENCH_SIZES=100,1000 pytest test_benchmarks.py
+"""
+
+import glob
+import json
+import os
+import random
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from bench_vc_parsers import synthetic_page
+from rate_limiter import RateLimiter
+from report_writer import PYARROW_AVAILABLE, ExcelReportWriter, PartitionedDatasetSink
+from scrape_fixtures import MODE_RECORD, MODE_REPLAY, FixtureStore
+from vc_page_parser import available_backends
+
+SIZES = [int(size) for size in os.environ.get('BENCH_SIZES', '100,1000,5000').split(',')]
+COMPANY = "Career Karma"
+GENERIC_VC_URL = "https://vc.example.com/portfolio"
+
+WORDS = ("raised a series b round with new investor backing, launching a beta product feature, "
+         "hiring a new CTO as the team grows, partnership deal and integration agreement, "
+         "great growth in revenue and customers, concerning layoffs and lawsuit news").split()
+
+
+def synthetic_tweets(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(8, 30))]
+        if rng.random() < 0.6:
+            words.insert(rng.randrange(len(words)), COMPANY)
+        yield {
+            'id': str(10 ** 15 + i),
+            'text': ' '.join(words),
+            'author': rng.choice(['techcrunch', 'someone', 'a16z', 'founder_jane', 'reuters']),
+            'author_followers': rng.randint(10, 2_000_000),
+            'timestamp': (start + timedelta(minutes=i)).isoformat(),
+            'likes': rng.randint(0, 5000),
+            'retweets': rng.randint(0, 800),
+            'replies': rng.randint(0, 300),
+            'url': f"https://twitter.com/someone/status/{10 ** 15 + i}",
+            'hashtags': rng.sample(['startup', 'funding', 'ai', 'edtech'], rng.randint(0, 2)),
+            'mentions': [],
+            'is_verified': rng.random() < 0.2
+        }
+
+
+def scaled(rows, size):
+    """Repeat recorded rows with fresh ids until there are `size` of them"""
+    for i in range(size):
+        row = dict(rows[i % len(rows)])
+        row['id'] = f"{row['id']}{i // len(rows):04d}" if i >= len(rows) else row['id']
+        yield row
+
+
+@pytest.fixture(scope="module")
+def twitter_service(tmp_path_factory):
+    """Import the Twitter service with its stores pointed at a scratch directory"""
+    scratch = tmp_path_factory.mktemp("service")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('TWITTER_STORE_PATH', str(scratch / 'tweets.sqlite3'))
+        mp.setenv('TWITTER_STATE_PATH', str(scratch / 'twitter_state.sqlite3'))
+        mp.setenv('VC_PAGE_CACHE_PATH', str(scratch / 'pages.sqlite3'))
+        mp.delenv('SCRAPE_FIXTURES_MODE', raising=False)
+        import twitter_scraper_service
+        yield twitter_scraper_service
+
+
+@pytest.fixture(scope="module")
+def recorded(tmp_path_factory):
+    """Recorded tweet rows and HTML pages, real when SCRAPE_FIXTURES_DIR is set"""
+    root = os.environ.get('SCRAPE_FIXTURES_DIR')
+    if root:
+        rows = []
+        for path in sorted(glob.glob(os.path.join(root, 'tweets', '*.jsonl'))):
+            with open(path, encoding='utf-8') as f:
+                rows.extend(json.loads(line) for line in f if line.strip())
+        pages = []
+        for path in sorted(glob.glob(os.path.join(root, 'pages', '*.html.json'))):
+            with open(path, encoding='utf-8') as f:
+                url = json.load(f)['url']
+            with open(path[:-len('.json')], 'rb') as f:
+                pages.append((url, f.read()))
+        if rows and pages:
+            return rows, pages
+
+    return list(synthetic_tweets(500)), [(GENERIC_VC_URL, synthetic_page(200))]
+
+
+def replay_store(tmp_path_factory, analyzer_cls, rows, size):
+    """Fixture directory holding `size` tweets for the company's first search query"""
+    root = str(tmp_path_factory.mktemp(f"fixtures-{size}"))
+    query = analyzer_cls(rate_limiter=RateLimiter(0, 0)).plan_search_queries(COMPANY)[0]
+    FixtureStore(root, MODE_RECORD).save_tweets(query, scaled(rows, size))
+    return FixtureStore(root, MODE_REPLAY)
+
+
+def run_measured(benchmark, fn, items, rounds=3):
+    """Benchmark fn and attach throughput and peak traced memory"""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = benchmark.pedantic(fn, rounds=rounds, iterations=1)
+    benchmark.extra_info.update({
+        'items': items,
+        'items_per_second': round(items / benchmark.stats.stats.mean),
+        'peak_memory_kb': peak // 1024
+    })
+    return result
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_analyze_tweet(benchmark, twitter_service, recorded, size):
+    analyzer = twitter_service.CompanyTwitterAnalyzer(rate_limiter=RateLimiter(0, 0))
+    tweets = [
+        twitter_service.Tweet(**{**row, 'timestamp': datetime.fromisoformat(row['timestamp'])})
+        for row in scaled(recorded[0], size)
+    ]
+
+    analyses = run_measured(benchmark, lambda: [analyzer.analyze_tweet(tweet, COMPANY) for tweet in tweets], size)
+    assert len(analyses) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_generate_company_report(benchmark, tmp_path_factory, twitter_service, recorded, size):
+    Analyzer = twitter_service.CompanyTwitterAnalyzer
+    store = replay_store(tmp_path_factory, Analyzer, recorded[0], size)
+    analyzer = Analyzer(rate_limiter=RateLimiter(0, 0), fixtures=store)
+
+    report = run_measured(benchmark, lambda: analyzer.generate_company_report(COMPANY, max_tweets=size), size)
+    assert report.total_tweets == size
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("size", SIZES)
+def test_vc_page_parsers(benchmark, twitter_service, recorded, backend, size):
+    scraper = twitter_service.VCPortfolioScraper(parser_backend=backend, rate_limiter=RateLimiter(0, 0))
+    content = synthetic_page(size)
+    # Recorded pages are parsed as-is; the synthetic page scales with size
+    pages = recorded[1] + [(GENERIC_VC_URL, content), ("https://www.necessary.vc/", content)]
+
+    companies = run_measured(benchmark, lambda: [scraper.parse_vc_page(url, body) for url, body in pages], size)
+    assert all(isinstance(found, list) for found in companies)
+
+
+def test_vc_site_replay(benchmark, tmp_path_factory, twitter_service, recorded):
+    root = str(tmp_path_factory.mktemp("pages"))
+    recorder = FixtureStore(root, MODE_RECORD)
+    for url, body in recorded[1]:
+        recorder.save_page(url, 200, {'Content-Type': 'text/html; charset=utf-8'}, body)
+
+    scraper = twitter_service.VCPortfolioScraper(rate_limiter=RateLimiter(0, 0), fixtures=FixtureStore(root, MODE_REPLAY))
+    urls = [url for url, _ in recorded[1]]
+
+    companies = run_measured(benchmark, lambda: scraper.scrape_multiple_vcs(urls), len(urls))
+    assert companies
+
+
+@pytest.mark.parametrize("format", ['xlsx', 'csv', 'ndjson'] + (['parquet'] if PYARROW_AVAILABLE else []))
+@pytest.mark.parametrize("size", SIZES)
+def test_report_writers(benchmark, tmp_path_factory, twitter_service, recorded, format, size):
+    Analyzer = twitter_service.CompanyTwitterAnalyzer
+    store = replay_store(tmp_path_factory, Analyzer, recorded[0], size)
+    report = Analyzer(rate_limiter=RateLimiter(0, 0), fixtures=store).generate_company_report(COMPANY, max_tweets=size)
+    companies = [f"{COMPANY} {i}" for i in range(5)]
+    out_dir = tmp_path_factory.mktemp(f"report-{format}-{size}")
+
+    def write():
+        if format == 'xlsx':
+            sink = ExcelReportWriter(str(out_dir / 'report.xlsx'), company_order=companies)
+        else:
+            sink = PartitionedDatasetSink(str(out_dir), format)
+        for company in companies:
+            sink.add_company(company, report)
+        return sink.close()
+
+    paths = run_measured(benchmark, write, size * len(companies))
+    assert paths
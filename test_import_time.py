@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Import-time budgets for the scraper services
+Imports each service in a fresh interpreter, the way a new worker or
+serverless instance starts, and checks that heavy dependencies stay unloaded,
+that the import fits its budget and that the first /health answers quickly.
+
+Budgets are about twice the times measured on a developer laptop (service
+imports ~200 ms, dominated by Flask; first /health ~10 ms). Scale them on slow
+machines with IMPORT_BUDGET_SCALE=2.
+
+Usage:
+    pytest test_import_time.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGET_SCALE = float(os.environ.get('IMPORT_BUDGET_SCALE', 1.0))
+ATTEMPTS = 3
+
+# Milliseconds for `import <service>` and for the first GET /health after it
+BUDGETS = {
+    'twitter_scraper_service': {'import_ms': 450, 'health_ms': 50},
+    'linkedin_scraper_service': {'import_ms': 450, 'health_ms': 50},
+}
+
+# Loaded on first use only; none of them is needed to start or to answer /health
+HEAVY_MODULES = ('pandas', 'numpy', 'requests', 'bs4', 'lxml', 'openpyxl', 'pyarrow', 'snscrape',
+                 'selenium', 'linkedin_scraper')
+
+PROBE = """
+import json, sys, time
+heavy = sys.argv[2].split(',')
+start = time.perf_counter()
+service = __import__(sys.argv[1])
+imported = time.perf_counter()
+loaded_at_import = [name for name in heavy if name in sys.modules]
+response = service.app.test_client().get('/health')
+answered = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'health_ms': (answered - imported) * 1000,
+    'status': response.status_code,
+    'loaded_at_import': loaded_at_import,
+    'loaded_after_health': [name for name in heavy if name in sys.modules],
+}))
+"""
+
+
+def probe(service: str, scratch) -> dict:
+    env = {key: value for key, value in os.environ.items() if not key.startswith('SCRAPE_FIXTURES')}
+    env.update({
+        'PYTHONPATH': REPO_DIR,
+        'TWITTER_STORE_PATH': str(scratch / 'tweets.sqlite3'),
+        'VC_PAGE_CACHE_PATH': str(scratch / 'pages.sqlite3'),
+        'LINKEDIN_CACHE_PATH': str(scratch / 'profiles.sqlite3'),
+        'LINKEDIN_SESSION_PATH': str(scratch / 'session.enc'),
+    })
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE, service, ','.join(HEAVY_MODULES)],
+        cwd=str(scratch), env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("service", sorted(BUDGETS))
+def test_service_import_budget(tmp_path, service):
+    # Best of a few cold starts, so a busy machine does not fail the budget on one outlier
+    runs = [probe(service, tmp_path) for _ in range(ATTEMPTS)]
+    best = {key: min(run[key] for run in runs) for key in ('import_ms', 'health_ms')}
+    run = runs[0]
+
+    assert run['status'] == 200
+    assert run['loaded_at_import'] == [], f"imported at startup: {run['loaded_at_import']}"
+    assert run['loaded_after_health'] == [], f"imported by /health: {run['loaded_after_health']}"
+    assert best['import_ms'] <= BUDGETS[service]['import_ms'] * BUDGET_SCALE, best
+    assert best['health_ms'] <= BUDGETS[service]['health_ms'] * BUDGET_SCALE, best
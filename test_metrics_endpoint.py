@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+/metrics endpoint tests
+Scrapes a company through each service from replayed fixtures, so the rate
+limiters have seen a host, then checks that /metrics renders the limiter
+gauges instead of failing, and that failed fetches are retried and counted.
+
+Usage:
+    pytest test_metrics_endpoint.py
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from rate_limiter import RateLimiter
+from scrape_fixtures import COMPANY_FIELDS, MODE_RECORD, MODE_REPLAY, FixtureStore
+
+COMPANY = "Career Karma"
+
+
+@pytest.fixture(scope="module")
+def scratch_env(tmp_path_factory):
+    """Point every store, cache and state file of the services at a scratch directory"""
+    scratch = tmp_path_factory.mktemp("metrics")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('TWITTER_STORE_PATH', str(scratch / 'tweets.sqlite3'))
+        mp.setenv('TWITTER_STATE_PATH', str(scratch / 'twitter_state.sqlite3'))
+        mp.setenv('VC_PAGE_CACHE_PATH', str(scratch / 'pages.sqlite3'))
+        mp.setenv('LINKEDIN_CACHE_PATH', str(scratch / 'profiles.sqlite3'))
+        mp.setenv('LINKEDIN_STATE_PATH', str(scratch / 'linkedin_state.sqlite3'))
+        mp.setenv('LINKEDIN_SESSION_PATH', '')
+        mp.delenv('SCRAPE_FIXTURES_MODE', raising=False)
+        yield scratch
+
+
+@pytest.fixture
+def fixtures(tmp_path):
+    return FixtureStore(str(tmp_path), MODE_RECORD), FixtureStore(str(tmp_path), MODE_REPLAY)
+
+
+def assert_limiter_metrics(status: int, body: str, host: str):
+    assert status == 200, body
+    assert 'rate_limiter_circuit_open{' in body
+    assert f'host="{host}"' in body
+
+
+def record_tweets(analyzer, recorder):
+    query = analyzer.plan_search_queries(COMPANY)[0]
+    recorder.save_tweets(query, [{
+        'id': '1790000000000000000',
+        'text': f"{COMPANY} raised a new funding round",
+        'author': 'techcrunch',
+        'author_followers': 1000,
+        'timestamp': datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat(),
+        'likes': 1,
+        'retweets': 0,
+        'replies': 0,
+        'url': 'https://twitter.com/techcrunch/status/1790000000000000000',
+        'hashtags': [],
+        'mentions': [],
+        'is_verified': False
+    }])
+
+
+def test_linkedin_metrics_after_scrape(scratch_env, fixtures, monkeypatch):
+    import linkedin_scraper_service as service
+    recorder, replayer = fixtures
+    record = service.scraper.registry.resolve(COMPANY)
+    recorder.save_company(record.linkedin_url, {field: None for field in COMPANY_FIELDS} | {'name': COMPANY})
+    monkeypatch.setattr(service.scraper, 'fixtures', replayer)
+
+    client = service.app.test_client()
+    assert client.get(f'/scrape/{COMPANY}?refresh=true').status_code == 200
+    response = client.get('/metrics')
+    assert_limiter_metrics(response.status_code, response.get_data(as_text=True), 'www.linkedin.com')
+
+
+def test_linkedin_retries_failed_fetch(scratch_env, fixtures, monkeypatch):
+    import linkedin_scraper_service as service
+    _, replayer = fixtures
+    # Nothing is recorded, so every replayed fetch fails
+    monkeypatch.setattr(service.scraper, 'fixtures', replayer)
+    monkeypatch.setattr(service.scraper, 'rate_limiter', RateLimiter(0, 0))
+    monkeypatch.setattr(service.scraper, 'scrape_retries', 2)
+
+    client = service.app.test_client()
+    assert client.get(f'/scrape/{COMPANY}?refresh=true').status_code == 404
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'outbound_retries_total{host="www.linkedin.com"} 2' in body.splitlines()
+    assert 'outbound_requests_total{host="www.linkedin.com",outcome="failure"} 3' in body.splitlines()
+
+
+def test_twitter_metrics_after_analysis(scratch_env, fixtures, monkeypatch):
+    import twitter_scraper_service as service
+    recorder, replayer = fixtures
+    record_tweets(service.analyzer, recorder)
+    monkeypatch.setattr(service.analyzer, 'fixtures', replayer)
+
+    client = service.app.test_client()
+    assert client.get(f'/analyze/{COMPANY}?refresh=true').status_code == 200
+    response = client.get('/metrics')
+    assert_limiter_metrics(response.status_code, response.get_data(as_text=True), 'twitter.com')
+
+
+def test_async_metrics_after_analysis(scratch_env, fixtures, monkeypatch):
+    pytest.importorskip('quart')
+    import twitter_async_service as service
+    recorder, replayer = fixtures
+    record_tweets(service.analyzer, recorder)
+    monkeypatch.setattr(service.analyzer, 'fixtures', replayer)
+
+    async def scrape_then_metrics():
+        client = service.app.test_client()
+        assert (await client.get(f'/analyze/{COMPANY}?refresh=true')).status_code == 200
+        response = await client.get('/metrics')
+        return response.status_code, await response.get_data(as_text=True)
+
+    assert_limiter_metrics(*asyncio.run(scrape_then_metrics()), 'twitter.com')
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Disk-backed TTL cache
+Stores JSON-serializable values in SQLite with a per-entry TTL and
+least-recently-used eviction once the cache grows past max_entries.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """A cached value together with its freshness information"""
+    key: str
+    value: Any
+    stored_at: float
+    expires_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class SQLiteTTLCache:
+    """Size-bounded key/value cache persisted to a SQLite file"""
+
+    def __init__(self, path: str, default_ttl: float = 3600.0, max_entries: int = 1000,
+                 max_stale: Optional[float] = None, namespace: str = "default"):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_stale = max_stale
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Connection to the store, opened (creating the file) on first use"""
+        if self._connection is None:
+            with self._connect_lock:
+                if self._connection is None:
+                    self._connection = self._connect()
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache_entries (namespace, last_access)"
+        )
+        conn.commit()
+        return conn
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for key, including stale ones within max_stale"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, stored_at, expires_at = row
+            if self.max_stale is not None and now > expires_at + self.max_stale:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+                )
+                self._conn.commit()
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key)
+            )
+            self._conn.commit()
+
+        return CacheEntry(key=key, value=json.loads(value), stored_at=stored_at, expires_at=expires_at)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting least recently used entries beyond max_entries"""
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        payload = json.dumps(value)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, stored_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, now, now + ttl, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _evict(self):
+        count = self._conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                "SELECT key FROM cache_entries WHERE namespace = ? ORDER BY last_access ASC LIMIT ?)",
+                (self.namespace, self.namespace, excess)
+            )
+            logger.debug(f"Evicted {excess} cache entries from {self.namespace}")
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Compact tweet storage
+Struct-of-arrays container for a company's analyzed tweets. Numeric fields
+are numpy columns, timestamps are integer epoch seconds, and repeated strings
+(authors, hashtags, mentions, categories, keywords) are interned once per
+batch. Rows are exposed through slotted views with the attribute names of
+Tweet and TweetAnalysis, so report writers can use either interchangeably.
+"""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+from lazy_import import lazy_module
+
+np = lazy_module('numpy')
+pd = lazy_module('pandas')
+
+TWEET_FIELDS = ('id', 'text', 'author', 'author_followers', 'timestamp', 'likes', 'retweets', 'replies',
+                'url', 'hashtags', 'mentions', 'is_verified')
+ANALYSIS_FIELDS = ('relevance_score', 'category', 'sentiment', 'keywords_matched', 'importance_level', 'summary')
+
+UINT64_MAX = 2 ** 64 - 1
+
+# Tweet URLs of this form are rebuilt from author and id instead of stored
+CANONICAL_URL = "https://twitter.com/{author}/status/{id}"
+
+
+class StringPool:
+    """Interns strings as integer codes"""
+
+    __slots__ = ('values', '_codes')
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def encode(self, values: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.code(value) for value in values), dtype=np.int32)
+
+    def encode_lists(self, lists: Iterable[Sequence[str]]):
+        """Flatten lists of strings into (offsets, codes), CSR style"""
+        offsets = [0]
+        codes: List[int] = []
+        for values in lists:
+            codes.extend(self.code(value) for value in values or ())
+            offsets.append(len(codes))
+        return np.asarray(offsets, dtype=np.int32), np.asarray(codes, dtype=np.int32)
+
+
+def _id_column(ids: Sequence[Any]) -> np.ndarray:
+    """Numeric tweet ids as uint64, falling back to strings for anything else"""
+    values = [str(value) for value in ids]
+    if all(value.isascii() and value.isdigit() and len(value) <= 20 for value in values):
+        numbers = [int(value) for value in values]
+        # Leading zeros would not survive the round trip
+        if all(n <= UINT64_MAX and str(n) == value for n, value in zip(numbers, values)):
+            return np.asarray(numbers, dtype=np.uint64)
+    return _object_column(values)
+
+
+def _epoch_column(timestamps: pd.Series):
+    """(epoch seconds, tz-aware flags) for a column of datetimes"""
+    if pd.api.types.is_datetime64_any_dtype(timestamps) and timestamps.dt.tz is not None:
+        seconds = timestamps.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy(dtype='datetime64[s]')
+        return seconds.astype(np.int64), np.ones(len(timestamps), dtype=bool)
+
+    # Naive datetimes are local time, as datetime.timestamp() treats them
+    values = timestamps.astype(object).tolist()
+    seconds = np.fromiter((value.timestamp() for value in values), dtype=np.float64, count=len(values))
+    aware = np.fromiter((value.tzinfo is not None for value in values), dtype=bool, count=len(values))
+    return np.floor(seconds).astype(np.int64), aware
+
+
+def _url_column(urls: Iterable[str], authors: Iterable[str], ids: Iterable[Any]) -> np.ndarray:
+    return _object_column(
+        None if url == CANONICAL_URL.format(author=author, id=id) else url
+        for url, author, id in zip(urls, authors, ids)
+    )
+
+
+def _object_column(values: Iterable[Any]) -> np.ndarray:
+    values = list(values)
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+class TweetBatch:
+    """Columnar tweets plus their analyses, in report order"""
+
+    __slots__ = ('strings', 'ids', 'text', 'author', 'author_followers', 'timestamp', 'timestamp_utc',
+                 'likes', 'retweets', 'replies', 'url', 'hashtag_offsets', 'hashtags', 'mention_offsets',
+                 'mentions', 'is_verified', 'relevance_score', 'category', 'sentiment', 'keyword_offsets',
+                 'keywords', 'importance_level', 'summary')
+
+    def __init__(self):
+        self.strings = StringPool()
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> 'TweetBatch':
+        """Build from an analyze_batch result (tweet columns plus analysis columns)"""
+        batch = cls()
+        strings = batch.strings
+
+        ids = frame['id'].tolist()
+        batch.ids = _id_column(ids)
+        batch.text = _object_column(frame['text'])
+        batch.author = strings.encode(frame['author'])
+        batch.author_followers = frame['author_followers'].to_numpy(dtype=np.int64)
+        batch.timestamp, batch.timestamp_utc = _epoch_column(frame['timestamp'])
+        batch.likes = frame['likes'].to_numpy(dtype=np.int32)
+        batch.retweets = frame['retweets'].to_numpy(dtype=np.int32)
+        batch.replies = frame['replies'].to_numpy(dtype=np.int32)
+        batch.url = _url_column(frame['url'], frame['author'], ids)
+        batch.hashtag_offsets, batch.hashtags = strings.encode_lists(frame['hashtags'])
+        batch.mention_offsets, batch.mentions = strings.encode_lists(frame['mentions'])
+        batch.is_verified = frame['is_verified'].to_numpy(dtype=bool)
+
+        batch.relevance_score = frame['relevance_score'].to_numpy(dtype=np.float64)
+        batch.category = strings.encode(frame['category'])
+        batch.sentiment = strings.encode(frame['sentiment'])
+        batch.keyword_offsets, batch.keywords = strings.encode_lists(frame['keywords_matched'])
+        batch.importance_level = strings.encode(frame['importance_level'])
+        batch.summary = _object_column(frame['summary'])
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.author)
+
+    @property
+    def tweets(self) -> 'RowSequence':
+        return RowSequence(self, TweetView)
+
+    @property
+    def analyses(self) -> 'RowSequence':
+        return RowSequence(self, AnalysisView)
+
+    def engagement(self) -> np.ndarray:
+        return self.likes.astype(np.int64) + self.retweets + self.replies
+
+    def counts(self, column: str) -> Dict[str, int]:
+        """Occurrences of each value of an interned column, in order of first appearance"""
+        return self._count_codes(getattr(self, column))
+
+    def keyword_counts(self) -> Dict[str, int]:
+        return self._count_codes(self.keywords)
+
+    def _count_codes(self, codes: np.ndarray) -> Dict[str, int]:
+        if not len(codes):
+            return {}
+        unique, first, counts = np.unique(codes, return_index=True, return_counts=True)
+        order = np.argsort(first, kind='stable')
+        return {self.strings.values[unique[i]]: int(counts[i]) for i in order}
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the batch, including string payloads"""
+        total = sum(getattr(self, name).nbytes for name in self.__slots__
+                    if isinstance(getattr(self, name, None), np.ndarray))
+        for column in (self.text, self.url, self.summary) + ((self.ids,) if self.ids.dtype == object else ()):
+            total += sum(sys.getsizeof(value) for value in column)
+        total += sum(sys.getsizeof(value) for value in self.strings.values)
+        return total
+
+    def _strings_at(self, offsets: np.ndarray, codes: np.ndarray, index: int) -> List[str]:
+        values = self.strings.values
+        return [values[code] for code in codes[offsets[index]:offsets[index + 1]]]
+
+
+class RowSequence(Sequence):
+    """Read-only sequence of row views over a batch"""
+
+    __slots__ = ('batch', 'view')
+
+    def __init__(self, batch: TweetBatch, view):
+        self.batch = batch
+        self.view = view
+
+    def __len__(self) -> int:
+        return len(self.batch)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.view(self.batch, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.view(self.batch, index)
+
+    def __iter__(self) -> Iterator:
+        view, batch = self.view, self.batch
+        for i in range(len(batch)):
+            yield view(batch, i)
+
+
+class RowView:
+    __slots__ = ('_batch', '_index')
+    FIELDS: Sequence[str] = ()
+
+    def __init__(self, batch: TweetBatch, index: int):
+        self._batch = batch
+        self._index = index
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+
+class TweetView(RowView):
+    """One tweet of a batch, with the attributes of Tweet"""
+
+    __slots__ = ()
+    FIELDS = TWEET_FIELDS
+
+    @property
+    def id(self) -> str:
+        return str(self._batch.ids[self._index])
+
+    @property
+    def text(self) -> str:
+        return self._batch.text[self._index]
+
+    @property
+    def author(self) -> str:
+        return self._batch.strings.values[self._batch.author[self._index]]
+
+    @property
+    def author_followers(self) -> int:
+        return int(self._batch.author_followers[self._index])
+
+    @property
+    def timestamp(self) -> datetime:
+        seconds = int(self._batch.timestamp[self._index])
+        if self._batch.timestamp_utc[self._index]:
+            return datetime.fromtimestamp(seconds, tz=timezone.utc)
+        return datetime.fromtimestamp(seconds)
+
+    @property
+    def likes(self) -> int:
+        return int(self._batch.likes[self._index])
+
+    @property
+    def retweets(self) -> int:
+        return int(self._batch.retweets[self._index])
+
+    @property
+    def replies(self) -> int:
+        return int(self._batch.replies[self._index])
+
+    @property
+    def url(self) -> str:
+        url = self._batch.url[self._index]
+        return CANONICAL_URL.format(author=self.author, id=self.id) if url is None else url
+
+    @property
+    def hashtags(self) -> List[str]:
+        return self._batch._strings_at(self._batch.hashtag_offsets, self._batch.hashtags, self._index)
+
+    @property
+    def mentions(self) -> List[str]:
+        return self._batch._strings_at(self._batch.mention_offsets, self._batch.mentions, self._index)
+
+    @property
+    def is_verified(self) -> bool:
+        return bool(self._batch.is_verified[self._index])
+
+
+class AnalysisView(RowView):
+    """Analysis of one tweet of a batch, with the attributes of TweetAnalysis"""
+
+    __slots__ = ()
+    FIELDS = ANALYSIS_FIELDS
+
+    @property
+    def relevance_score(self) -> float:
+        return float(self._batch.relevance_score[self._index])
+
+    @property
+    def category(self) -> str:
+        return self._batch.strings.values[self._batch.category[self._index]]
+
+    @property
+    def sentiment(self) -> str:
+        return self._batch.strings.values[self._batch.sentiment[self._index]]
+
+    @property
+    def keywords_matched(self) -> List[str]:
+        return self._batch._strings_at(self._batch.keyword_offsets, self._batch.keywords, self._index)
+
+    @property
+    def importance_level(self) -> str:
+        return self._batch.strings.values[self._batch.importance_level[self._index]]
+
+    @property
+    def summary(self) -> str:
+        return self._batch.summary[self._index]
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Local tweet store
+Persists scraped tweets per company in SQLite together with a since_id
+checkpoint, so reports only need to fetch tweets newer than the last run.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class TweetStore:
+    """SQLite-backed tweet store indexed by (company, timestamp, id)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Connection to the store, opened (creating the file) on first use"""
+        if self._connection is None:
+            with self._connect_lock:
+                if self._connection is None:
+                    self._connection = self._connect()
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tweets (
+                company TEXT NOT NULL,
+                id TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                text TEXT NOT NULL,
+                author TEXT NOT NULL,
+                author_followers INTEGER NOT NULL,
+                likes INTEGER NOT NULL,
+                retweets INTEGER NOT NULL,
+                replies INTEGER NOT NULL,
+                url TEXT,
+                hashtags TEXT,
+                mentions TEXT,
+                is_verified INTEGER NOT NULL,
+                PRIMARY KEY (company, id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_tweets_company_time ON tweets (company, timestamp, id);
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                company TEXT PRIMARY KEY,
+                since_id INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            );
+        """)
+        conn.commit()
+        return conn
+
+    def add_tweets(self, company: str, tweets: Iterable[Dict[str, Any]], advance_checkpoint: bool = True) -> int:
+        """Upsert tweets for a company and, unless told otherwise, advance its since_id checkpoint
+
+        Pass advance_checkpoint=False when the fetch may have skipped tweets older
+        than the ones given, so that the next fetch asks for them again.
+        """
+        rows = []
+        max_id = None
+        for tweet in tweets:
+            timestamp = tweet['timestamp']
+            rows.append((
+                company,
+                tweet['id'],
+                timestamp.timestamp() if isinstance(timestamp, datetime) else float(timestamp or 0),
+                tweet['text'],
+                tweet['author'],
+                tweet['author_followers'],
+                tweet['likes'],
+                tweet['retweets'],
+                tweet['replies'],
+                tweet['url'],
+                json.dumps(list(tweet['hashtags'] or [])),
+                json.dumps(list(tweet['mentions'] or [])),
+                int(bool(tweet['is_verified']))
+            ))
+            if str(tweet['id']).isdigit():
+                max_id = max(max_id or 0, int(tweet['id']))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tweets (company, id, timestamp, text, author, author_followers, likes, "
+                "retweets, replies, url, hashtags, mentions, is_verified) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            if advance_checkpoint and max_id is not None:
+                self._conn.execute(
+                    "INSERT INTO checkpoints (company, since_id, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(company) DO UPDATE SET since_id = MAX(since_id, excluded.since_id), "
+                    "updated_at = excluded.updated_at",
+                    (company, max_id, time.time())
+                )
+            self._conn.commit()
+
+        return len(rows)
+
+    def get_checkpoint(self, company: str) -> Optional[int]:
+        """Highest tweet id stored for a company, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT since_id FROM checkpoints WHERE company = ?", (company,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def load_tweets(self, company: str, since: float, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Stored tweets for a company newer than the since epoch, most recent first"""
+        query = (
+            "SELECT id, text, author, author_followers, timestamp, likes, retweets, replies, url, "
+            "hashtags, mentions, is_verified FROM tweets WHERE company = ? AND timestamp >= ? "
+            "ORDER BY timestamp DESC, id DESC"
+        )
+        params: tuple = (company, since)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [
+            {
+                'id': row[0],
+                'text': row[1],
+                'author': row[2],
+                'author_followers': row[3],
+                'timestamp': datetime.fromtimestamp(row[4], tz=timezone.utc),
+                'likes': row[5],
+                'retweets': row[6],
+                'replies': row[7],
+                'url': row[8],
+                'hashtags': json.loads(row[9]),
+                'mentions': json.loads(row[10]),
+                'is_verified': bool(row[11])
+            }
+            for row in rows
+        ]
+
+    def prune(self, older_than: float, company: Optional[str] = None) -> int:
+        """Delete tweets older than the given epoch, for one company or all; checkpoints are kept"""
+        query = "DELETE FROM tweets WHERE timestamp < ?"
+        params: tuple = (older_than,)
+        if company is not None:
+            query += " AND company = ?"
+            params += (company,)
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
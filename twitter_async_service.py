@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Async Twitter analysis service
+ASGI variant of twitter_scraper_service on Quart. VC pages are fetched as
+concurrent tasks over one pooled keep-alive httpx client, and company
+analyses run as tasks bounded by semaphores, so one process keeps many
+requests in flight while it waits on the network. Caching, rate limiting,
+parsing and analysis are shared with the Flask service.
+
+Run with an ASGI server:
+    hypercorn --bind 0.0.0.0:5003 twitter_async_service:app
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple
+
+from quart import Quart, Response, jsonify, request
+from quart_cors import cors
+
+from lazy_import import lazy_module
+from metrics import CONTENT_TYPE, REGISTRY, stage, timed
+from rate_limiter import CircuitOpenError
+from streaming import MIMETYPES, NDJSON, STREAM_HEADERS, encode_events_async, stream_format
+from twitter_scraper_service import (
+    DEFAULT_COMPANIES, SNSCRAPE_AVAILABLE, USER_AGENT, CompanyTwitterReport, VCPortfolioScraper, analyzer,
+    portfolio_scraper, report_to_dict, shared_state
+)
+
+httpx = lazy_module('httpx')
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def as_completed_tasks(calls: Dict[Any, Awaitable]) -> AsyncIterator[Tuple[Any, Any, Optional[BaseException]]]:
+    """Run awaitables as tasks and yield (key, result, error) as each finishes
+
+    Tasks that have not finished are cancelled when the consumer stops early,
+    e.g. when a client closes a stream.
+    """
+    tasks = {asyncio.ensure_future(call): key for key, call in calls.items()}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                yield tasks[task], None if error else task.result(), error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class AsyncVCFetcher:
+    """Fetches VC portfolio pages concurrently through a VCPortfolioScraper's cache, limiter and parsers"""
+
+    def __init__(self, scraper: VCPortfolioScraper, concurrency: int = 100):
+        self.scraper = scraper
+        self.concurrency = max(1, concurrency)
+        # Bounds pages in flight, including those waiting on the rate limiter
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Keep-alive client, created (and httpx imported) on the first fetch"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={'User-Agent': USER_AGENT},
+                timeout=15,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def scrape_vc_site(self, vc_url: str) -> List[str]:
+        fixtures = self.scraper.fixtures
+        if fixtures and (fixtures.replaying or fixtures.recording):
+            # Recorded fixtures are served through the sync scraper's requests adapters
+            return await asyncio.to_thread(self.scraper.scrape_vc_site, vc_url)
+        async with self._semaphore:
+            return await self._fetch_vc_site(vc_url)
+
+    @timed('vc_scrape_site')
+    async def _fetch_vc_site(self, vc_url: str) -> List[str]:
+        scraper = self.scraper
+        companies = []
+        cached = None
+
+        try:
+            # A local SQLite lookup, cheap enough to run on the event loop
+            cached, headers, fresh = scraper.lookup_cached_page(vc_url)
+            if fresh:
+                return cached['companies']
+
+            await scraper.rate_limiter.acquire_async(vc_url)
+            try:
+                with stage('vc_site_fetch'):
+                    response = await self.client.get(vc_url, headers=headers)
+            except httpx.HTTPError:
+                scraper.rate_limiter.record_failure(vc_url)
+                raise
+            scraper.rate_limiter.record_response(vc_url, response.status_code, response.headers)
+
+            # Parsing is CPU-bound, so it runs off the event loop
+            companies = await asyncio.to_thread(
+                scraper.handle_page_response, vc_url, cached, response.status_code, response.headers,
+                response.content, response.text
+            )
+
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping {vc_url}: {e}")
+            companies = cached['companies'] if cached else []
+        except Exception as e:
+            logger.error(f"Error scraping {vc_url}: {e}")
+
+        return companies
+
+    async def scrape_multiple_vcs(self, vc_urls: List[str]) -> List[str]:
+        """Fetch every site concurrently, merging companies in the order the sites were configured"""
+        results = await asyncio.gather(*(self.scrape_vc_site(vc_url) for vc_url in vc_urls))
+        return list(dict.fromkeys(company for companies in results for company in companies))
+
+    async def iter_scrape_multiple_vcs(self, vc_urls: List[str]) -> AsyncIterator[Tuple[str, List[str]]]:
+        """Yield (vc_url, companies not seen from earlier sites) as each site finishes"""
+        seen = set()
+        async for vc_url, companies, _ in as_completed_tasks({url: self.scrape_vc_site(url) for url in vc_urls}):
+            new_companies = [company for company in dict.fromkeys(companies) if company not in seen]
+            seen.update(new_companies)
+            yield vc_url, new_companies
+
+
+# snscrape has no async API, so each company's searches run on a bounded thread pool.
+# Waiting for a slot on the semaphore rather than in the pool's queue keeps queued
+# companies cancellable when a stream is closed.
+SEARCH_CONCURRENCY = int(os.environ.get('TWITTER_SEARCH_CONCURRENCY', 16))
+search_executor = ThreadPoolExecutor(max_workers=SEARCH_CONCURRENCY, thread_name_prefix="twitter-search")
+search_slots = asyncio.Semaphore(SEARCH_CONCURRENCY)
+
+async def generate_company_report(company_name: str, days_back: int = 7, max_tweets: int = 100,
+                                  incremental: bool = True) -> CompanyTwitterReport:
+    async with search_slots:
+        return await asyncio.get_running_loop().run_in_executor(search_executor, functools.partial(
+            analyzer.generate_company_report, company_name, days_back, max_tweets, incremental=incremental
+        ))
+
+def iter_company_reports(companies: List[str], days_back: int = 7,
+                         max_tweets: int = 50) -> AsyncIterator[Tuple[str, Any, Optional[BaseException]]]:
+    """Yield (company, report, error) for each company as its analysis finishes"""
+    return as_completed_tasks({
+        company: generate_company_report(company, days_back=days_back, max_tweets=max_tweets)
+        for company in companies
+    })
+
+def streaming_response(events: AsyncIterator[Dict[str, Any]], format: str) -> Response:
+    return Response(encode_events_async(events, format), mimetype=MIMETYPES[format], headers=STREAM_HEADERS)
+
+app = cors(Quart(__name__))
+
+vc_fetcher = AsyncVCFetcher(portfolio_scraper, concurrency=int(os.environ.get('VC_FETCH_CONCURRENCY', 100)))
+
+@app.after_serving
+async def close_clients():
+    await vc_fetcher.aclose()
+    search_executor.shutdown(wait=False, cancel_futures=True)
+
+@app.route('/health', methods=['GET'])
+async def health_check():
+    return jsonify({
+        "status": "healthy",
+        "snscrape_available": SNSCRAPE_AVAILABLE,
+        "concurrency": {
+            "vc_fetches": vc_fetcher.concurrency,
+            "twitter_searches": SEARCH_CONCURRENCY
+        },
+        "rate_limits": {**analyzer.rate_limiter.stats(), **portfolio_scraper.rate_limiter.stats()}
+    })
+
+@app.route('/metrics', methods=['GET'])
+async def metrics_endpoint():
+    """Prometheus metrics: stage latencies, throughput, cache and outbound request counters"""
+    analyzer.rate_limiter.publish_metrics()
+    portfolio_scraper.rate_limiter.publish_metrics()
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+@app.route('/analyze/<company_name>', methods=['GET'])
+async def analyze_company(company_name):
+    days_back = request.args.get('days', 7, type=int)
+    max_tweets = request.args.get('max_tweets', 100, type=int)
+    incremental = request.args.get('refresh', 'false').lower() != 'true'
+
+    report = await generate_company_report(company_name, days_back, max_tweets, incremental=incremental)
+
+    return jsonify({
+        "success": True,
+        "data": report_to_dict(report)
+    })
+
+@app.route('/analyze/stream', methods=['GET', 'POST'])
+async def analyze_companies_stream():
+    """Analyze many companies concurrently, streaming each report as soon as it is ready (NDJSON or SSE)"""
+    body = await request.get_json(silent=True) or {}
+    companies = body.get('companies') or [
+        company.strip() for company in request.args.get('companies', '').split(',') if company.strip()
+    ]
+    if not companies:
+        companies = await vc_fetcher.scrape_multiple_vcs(shared_state.vc_urls()) or DEFAULT_COMPANIES
+
+    days_back = int(body.get('days', request.args.get('days', 7, type=int)))
+    max_tweets = int(body.get('max_tweets', request.args.get('max_tweets', 100, type=int)))
+
+    async def events():
+        analyzed = failed = 0
+        async for company, report, error in iter_company_reports(companies, days_back, max_tweets):
+            if error:
+                failed += 1
+                yield {"type": "error", "company": company, "error": str(error)}
+            else:
+                analyzed += 1
+                yield {"type": "result", "company": company, "data": report_to_dict(report)}
+        yield {"type": "done", "count": analyzed, "failed": failed}
+
+    return streaming_response(events(), stream_format(request) or NDJSON)
+
+@app.route('/portfolio', methods=['GET'])
+async def get_portfolio_companies():
+    format = stream_format(request)
+    if format:
+        async def events():
+            count = 0
+            async for vc_url, companies in vc_fetcher.iter_scrape_multiple_vcs(shared_state.vc_urls()):
+                count += len(companies)
+                yield {"type": "result", "vc_url": vc_url, "companies": companies}
+            yield {"type": "done", "count": count}
+
+        return streaming_response(events(), format)
+
+    companies = await vc_fetcher.scrape_multiple_vcs(shared_state.vc_urls())
+    return jsonify({
+        "success": True,
+        "companies": companies,
+        "count": len(companies)
+    })
+
+@app.route('/add_vc', methods=['POST'])
+async def add_vc_url():
+    data = await request.get_json()
+    new_url = data.get('url')
+
+    if new_url and shared_state.add_vc_url(new_url):
+        return jsonify({
+            "success": True,
+            "message": f"Added {new_url}",
+            "total_vcs": len(shared_state.vc_urls())
+        })
+    else:
+        return jsonify({
+            "success": False,
+            "message": "URL already exists or invalid"
+        }), 400
+
+if __name__ == '__main__':
+    # Development server; run `hypercorn --bind 0.0.0.0:5003 twitter_async_service:app` in production
+    port = int(os.environ.get('PORT', 5003))
+    app.run(host='0.0.0.0', port=port, debug=os.environ.get('FLASK_DEBUG') == '1')
@@ -1,31 +1,48 @@
 #!/usr/bin/env python3
 
+from __future__ import annotations
+
 import json
 import logging
-import pandas as pd
-from typing import Dict, List, Optional, Any
+import threading
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, asdict
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 import time
 import os
 import re
 from datetime import datetime, timedelta
-import requests
+import hashlib
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin, urlparse
 
-try:
-    from bs4 import BeautifulSoup
-    BS4_AVAILABLE = True
-except ImportError:
-    BS4_AVAILABLE = False
+from company_registry import CompanyRegistry
+from keyword_matcher import KeywordMatcher
+from lazy_import import is_available, lazy_module
+from metrics import CACHE_REQUESTS, CONTENT_TYPE, REGISTRY, stage, timed
+from rate_limiter import CircuitOpenError, RateLimiter, worker_processes, worker_share
+from report_stats import ReportAggregator
+from report_writer import ExcelReportWriter, PartitionedDatasetSink, company_tweet_row, sheet_name, summary_row, tweet_row
+from scrape_fixtures import FixtureStore, fixtures_from_env
+from scrape_jobs import Job, JobManager
+from shared_state import SharedState
+from streaming import NDJSON, stream_format, streaming_response
+from tweet_batch import RowSequence, TweetBatch
+from tweet_store import TweetStore
+from ttl_cache import SQLiteTTLCache
+from vc_page_parser import parse_page
+
+# Heavy dependencies load on first use so workers start, and answer /health, quickly
+np = lazy_module('numpy')
+pd = lazy_module('pandas')
+requests = lazy_module('requests')
+sntwitter = lazy_module('snscrape.modules.twitter')
+SNSCRAPE_AVAILABLE = is_available('snscrape')
 
-try:
-    import snscrape.modules.twitter as sntwitter
-    SNSCRAPE_AVAILABLE = True
-except ImportError:
-    SNSCRAPE_AVAILABLE = False
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 @dataclass
 class Tweet:
@@ -55,16 +72,47 @@ class TweetAnalysis:
 class CompanyTwitterReport:
     company_name: str
     total_tweets: int
-    tweets: List[Tweet]
-    analyses: List[TweetAnalysis]
+    batch: TweetBatch
     summary_stats: Dict[str, Any]
     sentiment_breakdown: Dict[str, int]
     category_breakdown: Dict[str, int]
     top_keywords: List[str]
+    linkedin_url: Optional[str] = None
+    aggregate: Optional[ReportAggregator] = None
+    
+    @property
+    def tweets(self) -> RowSequence:
+        """Tweets in relevance order, as views with the attributes of Tweet"""
+        return self.batch.tweets
+    
+    @property
+    def analyses(self) -> RowSequence:
+        """Analyses matching tweets, as views with the attributes of TweetAnalysis"""
+        return self.batch.analyses
+
+TWITTER_SEARCH_URL = "https://twitter.com/search"
+MAX_SEARCH_QUERY_LENGTH = 450
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
 
 class CompanyTwitterAnalyzer:
     
-    def __init__(self):
+    def __init__(self, word_boundaries: bool = False, rate_limiter: Optional[RateLimiter] = None,
+                 tweet_store: Optional[TweetStore] = None, registry: Optional[CompanyRegistry] = None,
+                 fixtures: Optional[FixtureStore] = None):
+        self.tweet_store = tweet_store
+        self.fixtures = fixtures or fixtures_from_env()
+        self.registry = registry or CompanyRegistry.load()
+        
+        # Shared across threads so concurrent company tasks respect one search budget
+        self.rate_limiter = rate_limiter or RateLimiter(
+            requests_per_second=float(os.environ.get('TWITTER_SCRAPE_RPS', 1.0)),
+            domain_interval=float(os.environ.get('TWITTER_DOMAIN_INTERVAL', 1.0)),
+            processes=worker_processes()
+        )
+        # Failed searches are re-attempted this many times, after the limiter's backoff
+        self.search_retries = int(os.environ.get('TWITTER_SEARCH_RETRIES', 1))
+        # Stored tweets are kept at least this long, so a later, longer window can reuse them
+        self.store_retention_days = float(os.environ.get('TWITTER_STORE_RETENTION_DAYS', 30))
         self.vc_keywords = {
             'revenue': ['revenue', 'sales', 'income', 'earnings', 'profit', 'growth', 'ARR', 'MRR', 'customers', 'subscription'],
             'funding': ['funding', 'investment', 'round', 'raised', 'capital', 'investor', 'valuation', 'IPO', 'acquisition', 'merger'],
@@ -81,61 +129,156 @@ class CompanyTwitterAnalyzer:
             'wsj', 'nytimes', 'ft', 'forbes', 'businessinsider', 'cnbc',
             'a16z', 'sequoia', 'gv', 'accel', 'founderfund', 'bessemervp'
         ]
+        
+        self.positive_words = ['good', 'great', 'excellent', 'amazing', 'successful', 'growth', 'wins', 'positive', 'bullish']
+        self.negative_words = ['bad', 'terrible', 'awful', 'failed', 'struggling', 'concerning', 'negative', 'bearish']
+        
+        # One automaton over every category and sentiment lexicon, scanned once per tweet
+        self.keyword_matcher = KeywordMatcher({
+            **{('category', category): keywords for category, keywords in self.vc_keywords.items()},
+            ('sentiment', 'positive'): self.positive_words,
+            ('sentiment', 'negative'): self.negative_words
+        }, word_boundaries=word_boundaries)
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+    def _search_terms(self, company_name: str) -> List[str]:
+        terms = [f'"{company_name}"']
+        # A one-word name's quoted search already returns every "<name> funding" tweet
+        if len(company_name.split()) > 1:
+            terms.append(f'({company_name} funding)')
+        return terms
+
+    def plan_search_queries(self, company_name: str) -> List[str]:
+        """Combine a company's search terms into as few OR searches as the query length allows"""
+        queries = []
+        current = []
+        for term in self._search_terms(company_name):
+            candidate = ' OR '.join(current + [term])
+            if current and len(candidate) > MAX_SEARCH_QUERY_LENGTH:
+                queries.append(' OR '.join(current))
+                current = [term]
+            else:
+                current.append(term)
+        if current:
+            queries.append(' OR '.join(current))
+        return queries
 
-    def scrape_company_tweets(self, company_name: str, days_back: int = 7, max_tweets: int = 100) -> List[Tweet]:
+    def scrape_company_tweets(self, company_name: str, days_back: int = 7, max_tweets: int = 100,
+                              since_id: Optional[int] = None) -> List[Tweet]:
+        return self._scrape_company_tweets(company_name, days_back, max_tweets, since_id)[0]
+
+    @timed('twitter_scrape_company')
+    def _scrape_company_tweets(self, company_name: str, days_back: int, max_tweets: int,
+                               since_id: Optional[int]) -> Tuple[List[Tweet], bool]:
+        """Tweets found for a company, and whether every search ran to the end
+
+        A search that stopped at max_tweets or failed may have left older tweets unfetched.
+        """
         tweets = []
-        if not SNSCRAPE_AVAILABLE:
+        complete = True
+        if not SNSCRAPE_AVAILABLE and not (self.fixtures and self.fixtures.replaying):
             logger.error("snscrape not available - install with: pip install snscrape")
-            return tweets
-            
-        queries = [
-            f'"{company_name}"',
-            f'{company_name} funding',
-            f'{company_name} revenue'
-        ]
+            return tweets, False
         
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
+        seen_ids = set()
         
-        for query in queries[:2]:
+        for query in self.plan_search_queries(company_name):
+            if len(tweets) >= max_tweets:
+                complete = False
+                break
+            
             search_query = f'{query} since:{start_date.strftime("%Y-%m-%d")} until:{end_date.strftime("%Y-%m-%d")}'
+            if since_id:
+                search_query += f' since_id:{since_id}'
+            
+            def run_search() -> bool:
+                """Collect the query's tweets; False if it stopped at max_tweets"""
+                # Tweets already collected by a failed attempt are skipped as seen on the retry
+                with stage('twitter_search') as span:
+                    found_before = len(tweets)
+                    capped = False
+                    for tweet_obj in self.search_tweets(search_query):
+                        if tweet_obj.id in seen_ids:
+                            continue
+                        seen_ids.add(tweet_obj.id)
+                        
+                        tweets.append(tweet_obj)
+                        if len(tweets) >= max_tweets:
+                            capped = True
+                            break
+                    span.items = len(tweets) - found_before
+                return not capped
             
             try:
-                tweet_count = 0
-                for tweet in sntwitter.TwitterSearchScraper(search_query).get_items():
-                    if tweet_count >= max_tweets // len(queries):
-                        break
-                    
-                    tweet_obj = Tweet(
-                        id=str(tweet.id),
-                        text=tweet.rawContent,
-                        author=tweet.user.username,
-                        author_followers=tweet.user.followersCount or 0,
-                        timestamp=tweet.date,
-                        likes=tweet.likeCount or 0,
-                        retweets=tweet.retweetCount or 0,
-                        replies=tweet.replyCount or 0,
-                        url=tweet.url,
-                        hashtags=tweet.hashtags or [],
-                        mentions=[mention.username for mention in (tweet.mentionedUsers or [])],
-                        is_verified=tweet.user.verified or False
-                    )
-                    
-                    tweets.append(tweet_obj)
-                    tweet_count += 1
-                    
+                if not self.rate_limiter.call_with_retries(TWITTER_SEARCH_URL, run_search, self.search_retries):
+                    complete = False
+            except CircuitOpenError as e:
+                logger.warning(f"Skipping remaining searches for {company_name}: {e}")
+                complete = False
+                break
             except Exception as e:
                 logger.error(f"Error scraping with query '{query}': {e}")
+                complete = False
                 continue
         
         logger.info(f"Scraped {len(tweets)} tweets for {company_name}")
-        return tweets
+        return tweets, complete
+
+    def search_tweets(self, search_query: str) -> Iterator[Tweet]:
+        """Tweets for a search query from snscrape, or replayed from recorded fixtures"""
+        if self.fixtures and self.fixtures.replaying:
+            for row in self.fixtures.load_tweets(search_query) or []:
+                yield Tweet(**{**row, 'timestamp': datetime.fromisoformat(row['timestamp'])})
+            return
+        
+        tweets = (
+            Tweet(
+                id=str(tweet.id),
+                text=tweet.rawContent,
+                author=tweet.user.username,
+                author_followers=tweet.user.followersCount or 0,
+                timestamp=tweet.date,
+                likes=tweet.likeCount or 0,
+                retweets=tweet.retweetCount or 0,
+                replies=tweet.replyCount or 0,
+                url=tweet.url,
+                hashtags=tweet.hashtags or [],
+                mentions=[mention.username for mention in (tweet.mentionedUsers or [])],
+                is_verified=tweet.user.verified or False
+            )
+            for tweet in sntwitter.TwitterSearchScraper(search_query).get_items()
+        )
+        if self.fixtures and self.fixtures.recording:
+            tweets = self.fixtures.record_search(search_query, tweets)
+        yield from tweets
+
+    def collect_company_tweets(self, company_name: str, days_back: int = 7, max_tweets: int = 100,
+                               incremental: bool = True) -> List[Tweet]:
+        """Fetch tweets newer than the stored checkpoint and return the stored window
+
+        The checkpoint only advances when every search ran to the end, so tweets
+        left behind by a capped or failed search are fetched again next time.
+        Stored tweets older than both the window and TWITTER_STORE_RETENTION_DAYS
+        are pruned.
+        """
+        if self.tweet_store is None:
+            return self.scrape_company_tweets(company_name, days_back, max_tweets)
+        
+        since_id = self.tweet_store.get_checkpoint(company_name) if incremental else None
+        fresh, complete = self._scrape_company_tweets(company_name, days_back, max_tweets, since_id)
+        self.tweet_store.add_tweets(company_name, (asdict(tweet) for tweet in fresh), advance_checkpoint=complete)
+        logger.info(f"Stored {len(fresh)} new tweets for {company_name} (since_id={since_id}, complete={complete})")
+        
+        window_start = time.time() - days_back * 86400
+        self.tweet_store.prune(min(window_start, time.time() - self.store_retention_days * 86400), company=company_name)
+        rows = self.tweet_store.load_tweets(company_name, since=window_start, limit=max_tweets)
+        return [Tweet(**row) for row in rows]
 
+    @timed('analyze_tweet')
     def analyze_tweet(self, tweet: Tweet, company_name: str) -> TweetAnalysis:
         text_lower = tweet.text.lower()
+        matches = self.keyword_matcher.scan(text_lower)
         
         relevance_score = 0.0
         keywords_matched = []
@@ -144,14 +287,11 @@ logger = logging.getLogger(__name__)
             relevance_score += 2.0
         
         category_scores = {}
-        for category, keywords in self.vc_keywords.items():
-            category_score = 0
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    category_score += 1
-                    keywords_matched.append(keyword)
-                    relevance_score += 1.0 if category != 'negative' else -0.5
-            category_scores[category] = category_score
+        for category in self.vc_keywords:
+            matched = matches.get(('category', category), ())
+            category_scores[category] = len(matched)
+            keywords_matched.extend(matched)
+            relevance_score += len(matched) * (1.0 if category != 'negative' else -0.5)
         
         primary_category = max(category_scores.items(), key=lambda x: x[1])[0] if any(category_scores.values()) else 'general'
         
@@ -171,11 +311,8 @@ logger = logging.getLogger(__name__)
         else:
             importance_level = 'low'
         
-        positive_words = ['good', 'great', 'excellent', 'amazing', 'successful', 'growth', 'wins', 'positive', 'bullish']
-        negative_words = ['bad', 'terrible', 'awful', 'failed', 'struggling', 'concerning', 'negative', 'bearish']
-        
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+        positive_count = len(matches.get(('sentiment', 'positive'), ()))
+        negative_count = len(matches.get(('sentiment', 'negative'), ()))
         
         if positive_count > negative_count:
             sentiment = 'positive'
@@ -200,135 +337,330 @@ logger = logging.getLogger(__name__)
             summary=summary
         )
 
-    def generate_company_report(self, company_name: str, days_back: int = 7, max_tweets: int = 100) -> CompanyTwitterReport:
-        logger.info(f"Generating Twitter report for {company_name}")
+    def tweets_to_frame(self, tweets: List[Tweet]) -> pd.DataFrame:
+        """Columnar view of a list of tweets"""
+        return pd.DataFrame({
+            'id': pd.Series([t.id for t in tweets], dtype=object),
+            'text': pd.Series([t.text for t in tweets], dtype=object),
+            'author': pd.Series([t.author for t in tweets], dtype=object),
+            'author_followers': np.fromiter((t.author_followers for t in tweets), dtype=np.int64, count=len(tweets)),
+            'timestamp': [t.timestamp for t in tweets],
+            'likes': np.fromiter((t.likes for t in tweets), dtype=np.int64, count=len(tweets)),
+            'retweets': np.fromiter((t.retweets for t in tweets), dtype=np.int64, count=len(tweets)),
+            'replies': np.fromiter((t.replies for t in tweets), dtype=np.int64, count=len(tweets)),
+            'url': pd.Series([t.url for t in tweets], dtype=object),
+            'hashtags': [t.hashtags for t in tweets],
+            'mentions': [t.mentions for t in tweets],
+            'is_verified': np.fromiter((bool(t.is_verified) for t in tweets), dtype=bool, count=len(tweets))
+        })
+
+    def analyze_batch(self, tweets: Union[List[Tweet], pd.DataFrame], company_name: str) -> pd.DataFrame:
+        """Analyze many tweets at once, returning the tweet columns plus analysis columns.
+
+        Scores match analyze_tweet; only keyword scanning runs per row, everything
+        else is computed as column operations.
+        """
+        frame = tweets if isinstance(tweets, pd.DataFrame) else self.tweets_to_frame(tweets)
+        frame = frame.reset_index(drop=True)
+        n = len(frame)
+        categories = list(self.vc_keywords)
         
-        tweets = self.scrape_company_tweets(company_name, days_back, max_tweets)
+        text_lower = frame['text'].str.lower()
+        author_lower = frame['author'].str.lower()
         
-        analyses = []
-        for tweet in tweets:
-            analysis = self.analyze_tweet(tweet, company_name)
-            analyses.append(analysis)
+        category_counts = np.zeros((n, len(categories)), dtype=np.int64)
+        positive_counts = np.zeros(n, dtype=np.int64)
+        negative_counts = np.zeros(n, dtype=np.int64)
+        keywords_matched = []
         
-        combined = list(zip(tweets, analyses))
-        combined.sort(key=lambda x: x[1].relevance_score, reverse=True)
-        tweets, analyses = zip(*combined) if combined else ([], [])
+        for row, text in enumerate(text_lower):
+            matches = self.keyword_matcher.scan(text)
+            keywords = set()
+            for col, category in enumerate(categories):
+                matched = matches.get(('category', category))
+                if matched:
+                    category_counts[row, col] = len(matched)
+                    keywords.update(matched)
+            positive_counts[row] = len(matches.get(('sentiment', 'positive'), ()))
+            negative_counts[row] = len(matches.get(('sentiment', 'negative'), ()))
+            keywords_matched.append(list(keywords))
         
-        if analyses:
-            sentiment_breakdown = {
-                'positive': sum(1 for a in analyses if a.sentiment == 'positive'),
-                'negative': sum(1 for a in analyses if a.sentiment == 'negative'),
-                'neutral': sum(1 for a in analyses if a.sentiment == 'neutral')
-            }
-            
-            category_breakdown = {}
-            for analysis in analyses:
-                category_breakdown[analysis.category] = category_breakdown.get(analysis.category, 0) + 1
-            
-            all_keywords = []
-            for analysis in analyses:
-                all_keywords.extend(analysis.keywords_matched)
-            
-            top_keywords = [item[0] for item in pd.Series(all_keywords).value_counts().head(10).items()] if all_keywords else []
-            
-            avg_relevance = sum(a.relevance_score for a in analyses) / len(analyses)
-            high_importance_count = sum(1 for a in analyses if a.importance_level == 'high')
-            
-            summary_stats = {
-                'average_relevance_score': round(avg_relevance, 2),
-                'high_importance_tweets': high_importance_count,
-                'total_engagement': sum(t.likes + t.retweets + t.replies for t in tweets),
-                'verified_authors': sum(1 for t in tweets if t.is_verified),
-                'avg_author_followers': round(sum(t.author_followers for t in tweets) / len(tweets)) if tweets else 0
-            }
-        else:
-            sentiment_breakdown = {'positive': 0, 'negative': 0, 'neutral': 0}
-            category_breakdown = {}
-            top_keywords = []
-            summary_stats = {
-                'average_relevance_score': 0,
-                'high_importance_tweets': 0,
-                'total_engagement': 0,
-                'verified_authors': 0,
-                'avg_author_followers': 0
-            }
+        keyword_weights = np.array([1.0 if category != 'negative' else -0.5 for category in categories])
+        mentions_company = text_lower.str.contains(company_name.lower(), regex=False).to_numpy(dtype=bool)
+        high_value = author_lower.isin(self.high_value_accounts).to_numpy(dtype=bool)
+        verified = frame['is_verified'].to_numpy(dtype=bool)
+        likes = frame['likes'].to_numpy(dtype=np.float64)
+        retweets = frame['retweets'].to_numpy(dtype=np.float64)
+        replies = frame['replies'].to_numpy(dtype=np.float64)
+        followers = np.maximum(frame['author_followers'].to_numpy(dtype=np.float64), 1)
+        
+        engagement_score = (likes + retweets * 2 + replies) / followers * 1000
+        relevance = (
+            mentions_company * 2.0
+            + category_counts @ keyword_weights
+            + high_value * 3.0
+            + verified * 1.0
+            + np.minimum(engagement_score, 2.0)
+        )
+        
+        has_category = category_counts.any(axis=1)
+        category = np.where(has_category, np.array(categories, dtype=object)[category_counts.argmax(axis=1)], 'general')
+        importance = np.select([relevance >= 5.0, relevance >= 2.0], ['high', 'medium'], default='low')
+        sentiment = np.select(
+            [positive_counts > negative_counts, negative_counts > positive_counts],
+            ['positive', 'negative'],
+            default='neutral'
+        )
+        
+        author_desc = pd.Series(np.where(verified, "verified account", "account"), dtype=object)
+        author_desc = pd.Series(np.where(high_value, "high-profile ", ""), dtype=object) + author_desc
+        engagement = (frame['likes'] + frame['retweets'] + frame['replies']).astype(np.int64)
+        summary = (
+            pd.Series(category, dtype=object).str.title() + " mention by " + author_desc + " @" + frame['author']
+            + " (" + engagement.astype(str).astype(object) + " total engagement) - " + pd.Series(sentiment, dtype=object) + " sentiment"
+        )
+        
+        result = frame.copy()
+        result['relevance_score'] = np.round(relevance, 2)
+        result['category'] = category
+        result['sentiment'] = sentiment
+        result['keywords_matched'] = keywords_matched
+        result['importance_level'] = importance
+        result['summary'] = summary
+        result['engagement'] = engagement
+        return result
+
+    def analyses_from_frame(self, frame: pd.DataFrame) -> List[TweetAnalysis]:
+        """Per-tweet TweetAnalysis objects for an analyze_batch result"""
+        return [
+            TweetAnalysis(
+                relevance_score=float(row.relevance_score),
+                category=row.category,
+                sentiment=row.sentiment,
+                keywords_matched=row.keywords_matched,
+                importance_level=row.importance_level,
+                summary=row.summary
+            )
+            for row in frame[['relevance_score', 'category', 'sentiment', 'keywords_matched', 'importance_level', 'summary']].itertuples(index=False)
+        ]
+
+    def generate_company_report(self, company_name: str, days_back: int = 7, max_tweets: int = 100,
+                                incremental: bool = True) -> CompanyTwitterReport:
+        # Name variants from VC sites ("Career Karma Inc.") are searched under the registered name
+        record = self.registry.resolve(company_name)
+        if record:
+            company_name = record.name
+        
+        logger.info(f"Generating Twitter report for {company_name}")
+        
+        tweets = self.collect_company_tweets(company_name, days_back, max_tweets, incremental)
+        
+        with stage('tweet_analysis') as span:
+            frame = self.analyze_batch(tweets, company_name)
+            span.items = len(tweets)
+        order = np.argsort(-frame['relevance_score'].to_numpy(), kind='stable')
+        # Only the compact columnar batch outlives this call; tweets and the frame are dropped
+        batch = TweetBatch.from_frame(frame.iloc[order])
+        del tweets, frame
+        
+        aggregate = ReportAggregator().add_batch(batch)
         
         return CompanyTwitterReport(
             company_name=company_name,
-            total_tweets=len(tweets),
-            tweets=list(tweets),
-            analyses=list(analyses),
-            summary_stats=summary_stats,
-            sentiment_breakdown=sentiment_breakdown,
-            category_breakdown=category_breakdown,
-            top_keywords=top_keywords
+            total_tweets=len(batch),
+            batch=batch,
+            summary_stats=aggregate.summary_stats(),
+            sentiment_breakdown=aggregate.sentiment_breakdown(),
+            category_breakdown=aggregate.category_breakdown(),
+            top_keywords=aggregate.top_keywords(10),
+            linkedin_url=record.linkedin_url if record else None,
+            aggregate=aggregate
         )
 
+def substring_pattern(words: List[str]) -> 're.Pattern':
+    """One compiled alternation that matches if any of the words occurs as a substring"""
+    return re.compile('|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True)))
+
+def first_unique(candidates, limit: int) -> List[str]:
+    """First `limit` distinct candidates in page order, stopping as soon as enough are found"""
+    unique: Dict[str, None] = {}
+    for candidate in candidates:
+        unique[candidate] = None
+        if len(unique) >= limit:
+            break
+    return list(unique)
+
+NECESSARY_CANDIDATE_PATTERN = re.compile(r'\b[A-Z][a-zA-Z\s&.-]{2,30}\b')
+GENERIC_CANDIDATE_PATTERN = re.compile(r'\b[A-Z][a-zA-Z\s&.-]{2,40}\b')
+NECESSARY_EXCLUDE_PATTERN = substring_pattern([
+    'necessary', 'ventures', 'capital', 'portfolio', 'investment', 'fund',
+    'about', 'team', 'contact', 'invest', 'company', 'companies', 'startup',
+    'startups', 'technology', 'innovation', 'venture', 'business', 'growth',
+    'early', 'stage', 'seed', 'series', 'round', 'equity', 'partners',
+    'management', 'leadership', 'founder', 'founders', 'ceo', 'board',
+    'advisory', 'experience', 'careers', 'join', 'work', 'opportunity',
+    'news', 'blog', 'press', 'media', 'events', 'newsletter', 'subscribe',
+    'follow', 'twitter', 'linkedin', 'facebook', 'instagram', 'social',
+    'privacy', 'terms', 'cookies', 'legal', 'disclaimer', 'copyright',
+    'rights', 'reserved', 'policy', 'statement', 'notice'
+])
+SECTION_EXCLUDE_PATTERN = substring_pattern(['portfolio', 'about', 'team', 'contact'])
+GENERIC_EXCLUDE_PATTERN = substring_pattern(['ventures', 'capital', 'fund', 'partners'])
+
 class VCPortfolioScraper:
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+    def __init__(self, page_cache: Optional[SQLiteTTLCache] = None, max_workers: int = 8,
+                 parser_backend: Optional[str] = None, rate_limiter: Optional[RateLimiter] = None,
+                 fixtures: Optional[FixtureStore] = None):
+        self.page_cache = page_cache
+        self.fixtures = fixtures or fixtures_from_env()
+        # Hosts get their own buckets, so different VC sites are still fetched in parallel
+        self.rate_limiter = rate_limiter or RateLimiter(
+            requests_per_second=float(os.environ.get('VC_SCRAPE_RPS', 4.0)),
+            domain_interval=float(os.environ.get('VC_DOMAIN_INTERVAL', 1.0)),
+            processes=worker_processes()
+        )
+        self.parser_backend = parser_backend or os.environ.get('VC_PARSER_BACKEND', 'lxml')
+        self.max_workers = max_workers
+        self._session = None
+        self._session_lock = threading.Lock()
+    
+    @property
+    def session(self):
+        """HTTP session, created (and requests imported) on the first fetch"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+    
+    def _create_session(self):
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': USER_AGENT
         })
+        # Pool sized for concurrent fetches so connections are kept alive between crawls
+        if self.fixtures and (self.fixtures.replaying or self.fixtures.recording):
+            from fixture_adapters import RecordingAdapter, ReplayAdapter
+            if self.fixtures.replaying:
+                adapter = ReplayAdapter(self.fixtures)
+            else:
+                adapter = RecordingAdapter(self.fixtures, pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        else:
+            adapter = requests.adapters.HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
 
+    @timed('vc_scrape_site')
     def scrape_vc_site(self, vc_url: str) -> List[str]:
         companies = []
+        cached = None
         
         try:
-            response = self.session.get(vc_url, timeout=15)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            cached, headers, fresh = self.lookup_cached_page(vc_url)
+            if fresh:
+                return cached['companies']
             
-            if "necessary.vc" in vc_url:
-                companies = self._scrape_necessary_vc(soup)
-            elif "a16z.com" in vc_url:
-                companies = self._scrape_a16z(soup)
-            elif "sequoiacap.com" in vc_url:
-                companies = self._scrape_sequoia(soup)
-            elif "gv.com" in vc_url:
-                companies = self._scrape_gv(soup)
-            else:
-                companies = self._scrape_generic_vc(soup, vc_url)
+            self.rate_limiter.acquire(vc_url)
+            try:
+                with stage('vc_site_fetch'):
+                    response = self.session.get(vc_url, timeout=15, headers=headers)
+            except requests.RequestException:
+                self.rate_limiter.record_failure(vc_url)
+                raise
+            self.rate_limiter.record_response(vc_url, response.status_code, response.headers)
             
-            logger.info(f"Found {len(companies)} companies from {vc_url}: {companies}")
+            companies = self.handle_page_response(vc_url, cached, response.status_code, response.headers,
+                                                  response.content, response.text)
             
+        except CircuitOpenError as e:
+            # Dead sites fail fast; fall back to whatever was parsed last time
+            logger.warning(f"Skipping {vc_url}: {e}")
+            companies = cached['companies'] if cached else []
         except Exception as e:
             logger.error(f"Error scraping {vc_url}: {e}")
         
         return companies
     
-    def _scrape_necessary_vc(self, soup) -> List[str]:
-        companies = []
-        text_content = soup.get_text()
-        potential_companies = re.findall(r'\b[A-Z][a-zA-Z\s&.-]{2,30}\b', text_content)
-        
-        exclude_words = {
-            'necessary', 'ventures', 'capital', 'portfolio', 'investment', 'fund', 
-            'about', 'team', 'contact', 'invest', 'company', 'companies', 'startup',
-            'startups', 'technology', 'innovation', 'venture', 'business', 'growth',
-            'early', 'stage', 'seed', 'series', 'round', 'equity', 'partners',
-            'management', 'leadership', 'founder', 'founders', 'ceo', 'board',
-            'advisory', 'experience', 'careers', 'join', 'work', 'opportunity',
-            'news', 'blog', 'press', 'media', 'events', 'newsletter', 'subscribe',
-            'follow', 'twitter', 'linkedin', 'facebook', 'instagram', 'social',
-            'privacy', 'terms', 'cookies', 'legal', 'disclaimer', 'copyright',
-            'rights', 'reserved', 'policy', 'statement', 'notice'
-        }
+    def lookup_cached_page(self, vc_url: str) -> tuple:
+        """(cached entry value, conditional request headers, whether it is fresh) for a VC page"""
+        entry = self.page_cache.get(vc_url) if self.page_cache else None
+        cached = entry.value if entry else None
+        
+        # Fresh cache entries skip the network entirely
+        if entry and not entry.is_stale:
+            logger.info(f"Using cached companies for {vc_url}")
+            CACHE_REQUESTS.inc(cache='vc_pages', result='hit')
+            return cached, {}, True
+        
+        headers = {}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return cached, headers, False
+    
+    def handle_page_response(self, vc_url: str, cached: Optional[Dict[str, Any]], status_code: int,
+                             headers, content: bytes, text: str) -> List[str]:
+        """Companies from a fetched VC page, reusing the cached parse when the page has not changed"""
+        if status_code == 304 and cached:
+            logger.info(f"{vc_url} not modified, reusing {len(cached['companies'])} companies")
+            CACHE_REQUESTS.inc(cache='vc_pages', result='not_modified')
+            self.page_cache.set(vc_url, cached)
+            return cached['companies']
+        
+        body_hash = hashlib.sha256(content).hexdigest()
+        if cached and cached.get('body_hash') == body_hash:
+            CACHE_REQUESTS.inc(cache='vc_pages', result='unchanged')
+            companies = cached['companies']
+        else:
+            if self.page_cache is not None:
+                CACHE_REQUESTS.inc(cache='vc_pages', result='miss')
+            with stage('vc_page_parse') as span:
+                companies = self.parse_vc_page(vc_url, content)
+                span.items = len(companies)
         
-        for company in potential_companies:
-            company_clean = company.strip()
-            if (3 <= len(company_clean) <= 30 and 
-                not any(exclude in company_clean.lower() for exclude in exclude_words) and
-                not company_clean.isupper() and
-                not company_clean.islower() and
-                company_clean not in companies):
-                companies.append(company_clean)
+        if self.page_cache is not None and status_code < 400:
+            self.page_cache.set(vc_url, {
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'body_hash': body_hash,
+                'body': text,
+                'companies': companies
+            })
+        
+        logger.info(f"Found {len(companies)} companies from {vc_url}: {companies}")
+        return companies
+    
+    def parse_vc_page(self, vc_url: str, content: bytes) -> List[str]:
+        page = parse_page(content, self.parser_backend)
         
-        return companies[:15]
+        if "necessary.vc" in vc_url:
+            return self._scrape_necessary_vc(page)
+        elif "a16z.com" in vc_url:
+            return self._scrape_a16z(page)
+        elif "sequoiacap.com" in vc_url:
+            return self._scrape_sequoia(page)
+        elif "gv.com" in vc_url:
+            return self._scrape_gv(page)
+        else:
+            return self._scrape_generic_vc(page, vc_url)
+    
+    def _scrape_necessary_vc(self, page) -> List[str]:
+        candidates = (match.group().strip() for match in NECESSARY_CANDIDATE_PATTERN.finditer(page.get_text()))
+        return first_unique(
+            (company for company in candidates
+             if 3 <= len(company) <= 30 and
+             not company.isupper() and
+             not company.islower() and
+             not NECESSARY_EXCLUDE_PATTERN.search(company.lower())),
+            15
+        )
 
-    def _scrape_a16z(self, soup) -> List[str]:
+    def _scrape_a16z(self, page) -> List[str]:
         companies = []
-        company_elements = soup.find_all(['h2', 'h3', 'h4'], class_=re.compile(r'company|portfolio'))
+        company_elements = page.find_all(['h2', 'h3', 'h4'], class_words=['company', 'portfolio'])
         
         for elem in company_elements:
             name = elem.get_text().strip()
@@ -336,7 +668,7 @@ class VCPortfolioScraper:
                 companies.append(name)
         
         if not companies:
-            links = soup.find_all('a', href=True)
+            links = page.find_all(['a'], attr='href')
             for link in links:
                 text = link.get_text().strip()
                 if (text and 2 < len(text) < 50 and 
@@ -345,9 +677,9 @@ class VCPortfolioScraper:
         
         return companies[:20]
     
-    def _scrape_sequoia(self, soup) -> List[str]:
+    def _scrape_sequoia(self, page) -> List[str]:
         companies = []
-        company_divs = soup.find_all('div', class_=re.compile(r'company|portfolio|investment'))
+        company_divs = page.find_all(['div'], class_words=['company', 'portfolio', 'investment'])
         
         for div in company_divs:
             name_elem = div.find(['h1', 'h2', 'h3', 'h4', 'span'])
@@ -358,9 +690,9 @@ class VCPortfolioScraper:
         
         return companies[:20]
 
-    def _scrape_gv(self, soup) -> List[str]:
+    def _scrape_gv(self, page) -> List[str]:
         companies = []
-        portfolio_items = soup.find_all(['div', 'li'], class_=re.compile(r'portfolio|company'))
+        portfolio_items = page.find_all(['div', 'li'], class_words=['portfolio', 'company'])
         
         for item in portfolio_items:
             text = item.get_text().strip()
@@ -369,43 +701,60 @@ class VCPortfolioScraper:
         
         return companies[:20]
     
-    def _scrape_generic_vc(self, soup, url) -> List[str]:
-        companies = []
-        
-        portfolio_sections = soup.find_all(['section', 'div'], class_=re.compile(r'portfolio|companies|investments'))
+    def _scrape_generic_vc(self, page, url) -> List[str]:
+        portfolio_sections = page.find_all(['section', 'div'], class_words=['portfolio', 'companies', 'investments'])
         
-        for section in portfolio_sections:
-            company_elements = section.find_all(['h1', 'h2', 'h3', 'h4', 'li', 'span'])
-            for elem in company_elements:
-                text = elem.get_text().strip()
-                if (2 < len(text) < 50 and 
-                    text not in companies and
-                    not any(word in text.lower() for word in ['portfolio', 'about', 'team', 'contact'])):
-                    companies.append(text)
+        # Nested sections yield the same elements more than once; first_unique drops the repeats
+        texts = (
+            elem.get_text().strip()
+            for section in portfolio_sections
+            for elem in section.find_all(['h1', 'h2', 'h3', 'h4', 'li', 'span'])
+        )
+        companies = first_unique(
+            (text for text in texts if 2 < len(text) < 50 and not SECTION_EXCLUDE_PATTERN.search(text.lower())),
+            15
+        )
         
         if not companies:
-            all_text = soup.get_text()
-            potential_companies = re.findall(r'\b[A-Z][a-zA-Z\s&.-]{2,40}\b', all_text)
-            
-            for company in potential_companies:
-                if (company not in companies and 
-                    len(company) > 2 and 
-                    not any(word in company.lower() for word in ['ventures', 'capital', 'fund', 'partners'])):
-                    companies.append(company)
+            candidates = (match.group() for match in GENERIC_CANDIDATE_PATTERN.finditer(page.get_text()))
+            companies = first_unique(
+                (company for company in candidates
+                 if len(company) > 2 and not GENERIC_EXCLUDE_PATTERN.search(company.lower())),
+                15
+            )
         
-        return companies[:15]
+        return companies
 
     def scrape_multiple_vcs(self, vc_urls: List[str]) -> List[str]:
         all_companies = []
+        if not vc_urls:
+            return all_companies
         
-        for url in vc_urls:
-            companies = self.scrape_vc_site(url)
-            all_companies.extend(companies)
+        # Fetch concurrently but merge in the order the sites were configured
+        with ThreadPoolExecutor(max_workers=min(len(vc_urls), self.max_workers), thread_name_prefix="vc-fetch") as executor:
+            for companies in executor.map(self.scrape_vc_site, vc_urls):
+                all_companies.extend(companies)
         
         unique_companies = list(dict.fromkeys(all_companies))
         return unique_companies
 
-vc_urls = [
+    def iter_scrape_multiple_vcs(self, vc_urls: List[str]) -> Iterator[tuple]:
+        """Yield (vc_url, companies not seen from earlier sites) as each site finishes"""
+        if not vc_urls:
+            return
+        
+        seen = set()
+        executor = ThreadPoolExecutor(max_workers=min(len(vc_urls), self.max_workers), thread_name_prefix="vc-fetch")
+        try:
+            futures = {executor.submit(self.scrape_vc_site, vc_url): vc_url for vc_url in vc_urls}
+            for future in as_completed(futures):
+                new_companies = [company for company in dict.fromkeys(future.result()) if company not in seen]
+                seen.update(new_companies)
+                yield futures[future], new_companies
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+DEFAULT_VC_URLS = [
     "https://www.necessary.vc/",
     "https://a16z.com/portfolio/",
     "https://www.sequoiacap.com/companies/",
@@ -415,110 +764,123 @@ vc_urls = [
     "https://www.bessemervp.com/companies"
 ]
 
+# Analyzed when no VC site yields any companies
+DEFAULT_COMPANIES = ["Airbnb", "Stripe", "SpaceX", "Tesla", "Notion", "Figma", "Discord", "Zoom"]
+
 app = Flask(__name__)
 CORS(app)
 
-analyzer = CompanyTwitterAnalyzer()
-portfolio_scraper = VCPortfolioScraper()
+# VC URLs added through /add_vc and job snapshots, shared by every worker process
+shared_state = SharedState(os.environ.get('TWITTER_STATE_PATH', 'twitter_state.sqlite3'), default_vc_urls=DEFAULT_VC_URLS)
+
+analyzer = CompanyTwitterAnalyzer(tweet_store=TweetStore(os.environ.get('TWITTER_STORE_PATH', 'tweet_store.sqlite3')))
+portfolio_scraper = VCPortfolioScraper(page_cache=SQLiteTTLCache(
+    os.environ.get('VC_PAGE_CACHE_PATH', 'vc_page_cache.sqlite3'),
+    default_ttl=float(os.environ.get('VC_PAGE_MAX_AGE', 300)),
+    max_entries=500,
+    namespace='vc_pages'
+))
 
 @app.route('/health', methods=['GET'])
 def health_check():
     return jsonify({
         "status": "healthy",
-        "snscrape_available": SNSCRAPE_AVAILABLE
+        "snscrape_available": SNSCRAPE_AVAILABLE,
+        "rate_limits": {**analyzer.rate_limiter.stats(), **portfolio_scraper.rate_limiter.stats()}
     })
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metrics: stage latencies, throughput, cache and outbound request counters"""
+    analyzer.rate_limiter.publish_metrics()
+    portfolio_scraper.rate_limiter.publish_metrics()
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+job_manager = JobManager(max_concurrent_jobs=worker_share(int(os.environ.get('SCRAPE_JOB_WORKERS', 1))), store=shared_state)
+
+def shutdown():
+    """Stop the job executor and record unfinished jobs as failed; run when the process exits"""
+    job_manager.shutdown()
+
+def report_to_dict(report: CompanyTwitterReport) -> Dict[str, Any]:
+    return {
+        "company_name": report.company_name,
+        "total_tweets": report.total_tweets,
+        "summary_stats": report.summary_stats,
+        "sentiment_breakdown": report.sentiment_breakdown,
+        "category_breakdown": report.category_breakdown,
+        "top_keywords": report.top_keywords,
+        "linkedin_url": report.linkedin_url
+    }
+
 @app.route('/analyze/<company_name>', methods=['GET'])
 def analyze_company(company_name):
     days_back = request.args.get('days', 7, type=int)
     max_tweets = request.args.get('max_tweets', 100, type=int)
+    incremental = request.args.get('refresh', 'false').lower() != 'true'
     
-    report = analyzer.generate_company_report(company_name, days_back, max_tweets)
+    report = analyzer.generate_company_report(company_name, days_back, max_tweets, incremental=incremental)
     
     return jsonify({
         "success": True,
-        "data": {
-            "company_name": report.company_name,
-            "total_tweets": report.total_tweets,
-            "summary_stats": report.summary_stats,
-            "sentiment_breakdown": report.sentiment_breakdown,
-            "category_breakdown": report.category_breakdown,
-            "top_keywords": report.top_keywords
-        }
+        "data": report_to_dict(report)
     })
 
-def analyze_all_portfolio_companies():
-    print("Scraping portfolio companies from multiple VC sites...")
-    
-    companies = portfolio_scraper.scrape_multiple_vcs(vc_urls)
+def iter_company_reports(companies: List[str], max_workers: Optional[int] = None, days_back: int = 7,
+                         max_tweets: int = 50) -> Iterator[tuple]:
+    """Yield (company, report, error) for each company as its analysis finishes"""
+    max_workers = max_workers or int(os.environ.get('TWITTER_ANALYSIS_WORKERS', 4))
     
+    # Each company is one task; the analyzer's rate limiter paces the searches
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="twitter-analysis")
+    try:
+        futures = {
+            executor.submit(analyzer.generate_company_report, company, days_back=days_back, max_tweets=max_tweets): company
+            for company in companies
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+    finally:
+        # A closed stream stops companies that have not started yet
+        executor.shutdown(wait=True, cancel_futures=True)
+
+@app.route('/analyze/stream', methods=['GET', 'POST'])
+def analyze_companies_stream():
+    """Analyze many companies, streaming each report as soon as it is ready (NDJSON or SSE)"""
+    body = request.get_json(silent=True) or {}
+    companies = body.get('companies') or [
+        company.strip() for company in request.args.get('companies', '').split(',') if company.strip()
+    ]
     if not companies:
-        print("No companies found. Using default list.")
-        companies = ["Airbnb", "Stripe", "SpaceX", "Tesla", "Notion", "Figma", "Discord", "Zoom"]
+        companies = portfolio_scraper.scrape_multiple_vcs(shared_state.vc_urls()) or DEFAULT_COMPANIES
     
-    print(f"Found {len(companies)} total companies from all VC sites:")
-    for i, company in enumerate(companies, 1):
-        print(f"  {i}. {company}")
-    
-    all_reports = {}
-    all_tweets_data = []
+    days_back = int(body.get('days', request.args.get('days', 7, type=int)))
+    max_tweets = int(body.get('max_tweets', request.args.get('max_tweets', 100, type=int)))
+    max_workers = body.get('workers') or request.args.get('workers', type=int)
     
-    print(f"\nAnalyzing Twitter mentions for {len(companies)} companies...")
-    
-    for i, company in enumerate(companies, 1):
-        print(f"[{i}/{len(companies)}] Analyzing {company}...")
-        
-        try:
-            report = analyzer.generate_company_report(company, days_back=7, max_tweets=50)
-            all_reports[company] = report
-            
-            for tweet, analysis in zip(report.tweets, report.analyses):
-                all_tweets_data.append({
-                    'Company': company,
-                    'Tweet ID': tweet.id,
-                    'Author': tweet.author,
-                    'Author Followers': tweet.author_followers,
-                    'Verified': tweet.is_verified,
-                    'Text': tweet.text,
-                    'Timestamp': tweet.timestamp,
-                    'Likes': tweet.likes,
-                    'Retweets': tweet.retweets,
-                    'Replies': tweet.replies,
-                    'URL': tweet.url,
-                    'Relevance Score': analysis.relevance_score,
-                    'Category': analysis.category,
-                    'Sentiment': analysis.sentiment,
-                    'Importance': analysis.importance_level,
-                    'Keywords': ', '.join(analysis.keywords_matched),
-                    'Summary': analysis.summary
-                })
-            
-            print(f"  Found {report.total_tweets} tweets")
-            time.sleep(2)
-            
-        except Exception as e:
-            print(f"  Error analyzing {company}: {e}")
-            continue
+    def events():
+        analyzed = failed = 0
+        for company, report, error in iter_company_reports(companies, max_workers, days_back, max_tweets):
+            if error:
+                failed += 1
+                yield {"type": "error", "company": company, "error": str(error)}
+            else:
+                analyzed += 1
+                yield {"type": "result", "company": company, "data": report_to_dict(report)}
+        yield {"type": "done", "count": analyzed, "failed": failed}
     
-    print(f"\nGenerating comprehensive Excel report...")
+    return streaming_response(events(), stream_format(request) or NDJSON)
+
+@timed('report_write_xlsx_buffered')
+def write_buffered_excel_report(filename: str, all_reports: Dict[str, CompanyTwitterReport], all_tweets_data: List[Dict[str, Any]]):
     output = BytesIO()
     
     with pd.ExcelWriter(output, engine='openpyxl') as writer:
         
-        portfolio_summary = []
-        for company, report in all_reports.items():
-            portfolio_summary.append({
-                'Company': company,
-                'Total Tweets': report.total_tweets,
-                'Avg Relevance Score': report.summary_stats['average_relevance_score'],
-                'High Importance': report.summary_stats['high_importance_tweets'],
-                'Total Engagement': report.summary_stats['total_engagement'],
-                'Positive Sentiment': report.sentiment_breakdown['positive'],
-                'Negative Sentiment': report.sentiment_breakdown['negative'],
-                'Neutral Sentiment': report.sentiment_breakdown['neutral'],
-                'Top Category': max(report.category_breakdown.items(), key=lambda x: x[1])[0] if report.category_breakdown else 'None'
-            })
-        
+        portfolio_summary = [summary_row(company, report) for company, report in all_reports.items()]
         pd.DataFrame(portfolio_summary).to_excel(writer, sheet_name='Portfolio Summary', index=False)
         
         if all_tweets_data:
@@ -526,36 +888,15 @@ def analyze_all_portfolio_companies():
             all_tweets_df = all_tweets_df.sort_values(['Company', 'Relevance Score'], ascending=[True, False])
             all_tweets_df.to_excel(writer, sheet_name='All Tweets', index=False)
         
+        used_names = {'portfolio summary', 'all tweets', 'overall sentiment', 'overall categories'}
         for company, report in all_reports.items():
             if report.tweets:
-                company_tweets = []
-                for tweet, analysis in zip(report.tweets, report.analyses):
-                    company_tweets.append({
-                        'Tweet ID': tweet.id,
-                        'Author': tweet.author,
-                        'Verified': tweet.is_verified,
-                        'Text': tweet.text,
-                        'Timestamp': tweet.timestamp,
-                        'Likes': tweet.likes,
-                        'Retweets': tweet.retweets,
-                        'Relevance Score': analysis.relevance_score,
-                        'Category': analysis.category,
-                        'Sentiment': analysis.sentiment,
-                        'Importance': analysis.importance_level,
-                        'Summary': analysis.summary
-                    })
-                
-                sheet_name = company[:31]
-                pd.DataFrame(company_tweets).to_excel(writer, sheet_name=sheet_name, index=False)
-        
-        overall_sentiment = {'positive': 0, 'negative': 0, 'neutral': 0}
-        overall_categories = {}
-        
-        for report in all_reports.values():
-            for sentiment, count in report.sentiment_breakdown.items():
-                overall_sentiment[sentiment] += count
-            for category, count in report.category_breakdown.items():
-                overall_categories[category] = overall_categories.get(category, 0) + count
+                company_tweets = [company_tweet_row(tweet, analysis) for tweet, analysis in zip(report.tweets, report.analyses)]
+                pd.DataFrame(company_tweets).to_excel(writer, sheet_name=sheet_name(company, used_names), index=False)
+        
+        totals = ReportAggregator.merged(report.aggregate for report in all_reports.values())
+        overall_sentiment = totals.sentiment_breakdown()
+        overall_categories = totals.category_breakdown()
         
         sentiment_df = pd.DataFrame([
             {'Sentiment': k, 'Count': v} for k, v in overall_sentiment.items()
@@ -568,17 +909,93 @@ def analyze_all_portfolio_companies():
             ])
             categories_df.to_excel(writer, sheet_name='Overall Categories', index=False)
     
-    output.seek(0)
+    with open(filename, 'wb') as f:
+        f.write(output.getvalue())
+
+def analyze_all_portfolio_companies(job: Optional[Job] = None, max_workers: Optional[int] = None,
+                                    streaming: bool = True, export_formats: Optional[List[str]] = None):
+    print("Scraping portfolio companies from multiple VC sites...")
+    
+    companies = portfolio_scraper.scrape_multiple_vcs(shared_state.vc_urls())
+    
+    if not companies:
+        print("No companies found. Using default list.")
+        companies = DEFAULT_COMPANIES
+    
+    if job:
+        job.set_total(len(companies))
+    
+    print(f"Found {len(companies)} total companies from all VC sites:")
+    for i, company in enumerate(companies, 1):
+        print(f"  {i}. {company}")
+    
+    all_reports = {}
+    all_tweets_data = []
+    companies_analyzed = 0
+    total_tweets = 0
+    max_workers = max_workers or int(os.environ.get('TWITTER_ANALYSIS_WORKERS', 4))
     
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     filename = f"vc_portfolio_twitter_analysis_{timestamp}.xlsx"
     
-    with open(filename, 'wb') as f:
-        f.write(output.getvalue())
+    # Streaming mode writes each company's rows to disk as soon as it finishes
+    writer = ExcelReportWriter(filename, company_order=companies) if streaming else None
+    
+    if export_formats is None:
+        export_formats = [fmt.strip() for fmt in os.environ.get('REPORT_EXPORT_FORMATS', '').split(',') if fmt.strip()]
+    export_dir = os.environ.get('REPORT_EXPORT_DIR', 'report_exports')
+    dataset_sinks = [PartitionedDatasetSink(export_dir, fmt, run_id=timestamp) for fmt in export_formats]
+    
+    print(f"\nAnalyzing Twitter mentions for {len(companies)} companies with {max_workers} workers...")
+    
+    reports = iter_company_reports(companies, max_workers, days_back=7, max_tweets=50)
+    for i, (company, report, error) in enumerate(reports, 1):
+        if error:
+            print(f"[{i}/{len(companies)}] Error analyzing {company}: {error}")
+            if job:
+                job.advance()
+            continue
+        
+        companies_analyzed += 1
+        total_tweets += report.total_tweets
+        
+        for sink in dataset_sinks:
+            sink.add_company(company, report)
+        
+        if writer:
+            writer.add_company(company, report)
+        else:
+            all_reports[company] = report
+            for tweet, analysis in zip(report.tweets, report.analyses):
+                all_tweets_data.append(tweet_row(company, tweet, analysis))
+        
+        print(f"[{i}/{len(companies)}] {company}: found {report.total_tweets} tweets")
+        if job:
+            job.add_result(company, report_to_dict(report))
+    
+    print(f"\nGenerating comprehensive Excel report...")
+    
+    if writer:
+        writer.close()
+    else:
+        # Keep the report in portfolio order regardless of completion order
+        all_reports = {company: all_reports[company] for company in companies if company in all_reports}
+        write_buffered_excel_report(filename, all_reports, all_tweets_data)
+    
+    export_paths = []
+    for sink in dataset_sinks:
+        export_paths.extend(sink.close())
+    
+    if job:
+        job.add_artifact(filename)
+        for path in export_paths:
+            job.add_artifact(path)
     
     print(f"\nAnalysis complete! Report saved as: {filename}")
-    print(f"Analyzed {len(all_reports)} companies")
-    print(f"Found {len(all_tweets_data)} total tweets")
+    if export_paths:
+        print(f"Exported {len(export_paths)} {'/'.join(export_formats)} files under: {export_dir}")
+    print(f"Analyzed {companies_analyzed} companies")
+    print(f"Found {total_tweets} total tweets")
     print(f"Report includes:")
     print(f"   - Portfolio Summary sheet")
     print(f"   - All Tweets master list")
@@ -589,7 +1006,18 @@ def analyze_all_portfolio_companies():
 
 @app.route('/portfolio', methods=['GET'])
 def get_portfolio_companies():
-    companies = portfolio_scraper.scrape_multiple_vcs(vc_urls)
+    format = stream_format(request)
+    if format:
+        def events():
+            count = 0
+            for vc_url, companies in portfolio_scraper.iter_scrape_multiple_vcs(shared_state.vc_urls()):
+                count += len(companies)
+                yield {"type": "result", "vc_url": vc_url, "companies": companies}
+            yield {"type": "done", "count": count}
+        
+        return streaming_response(events(), format)
+    
+    companies = portfolio_scraper.scrape_multiple_vcs(shared_state.vc_urls())
     return jsonify({
         "success": True,
         "companies": companies,
@@ -601,12 +1029,11 @@ def add_vc_url():
     data = request.get_json()
     new_url = data.get('url')
     
-    if new_url and new_url not in vc_urls:
-        vc_urls.append(new_url)
+    if new_url and shared_state.add_vc_url(new_url):
         return jsonify({
             "success": True,
             "message": f"Added {new_url}",
-            "total_vcs": len(vc_urls)
+            "total_vcs": len(shared_state.vc_urls())
         })
     else:
         return jsonify({
@@ -617,7 +1044,8 @@ def add_vc_url():
 @app.route('/analyze_all', methods=['POST'])
 def run_full_analysis():
     try:
-        filename = analyze_all_portfolio_companies()
+        max_workers = request.args.get('workers', type=int)
+        filename = analyze_all_portfolio_companies(max_workers=max_workers)
         return jsonify({
             "success": True,
             "filename": filename,
@@ -629,8 +1057,64 @@ def run_full_analysis():
             "error": str(e)
         }), 500
 
+@app.route('/jobs/analyze_all', methods=['POST'])
+def submit_analyze_all_job():
+    max_workers = request.args.get('workers', type=int)
+    formats = request.args.get('formats')
+    export_formats = [fmt.strip() for fmt in formats.split(',') if fmt.strip()] if formats else None
+    job = job_manager.submit('analyze_all', analyze_all_portfolio_companies, max_workers,
+                             export_formats=export_formats,
+                             params={"workers": max_workers, "formats": export_formats})
+    return jsonify({
+        "success": True,
+        "job_id": job.id,
+        "status": job.status
+    }), 202
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    jobs = job_manager.snapshots()
+    return jsonify({
+        "jobs": jobs,
+        "count": len(jobs)
+    })
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    job = job_manager.snapshot(job_id)
+    if not job:
+        return jsonify({"success": False, "error": f"Job {job_id} not found"}), 404
+    
+    return jsonify({
+        "success": True,
+        "job": job
+    })
+
+@app.route('/jobs/<job_id>/results', methods=['GET'])
+def get_job_results(job_id):
+    job = job_manager.snapshot(job_id, include_results=True)
+    if not job:
+        return jsonify({"success": False, "error": f"Job {job_id} not found"}), 404
+    
+    return jsonify({
+        "success": True,
+        "job": job
+    })
+
+@app.route('/jobs/<job_id>/artifact', methods=['GET'])
+def download_job_artifact(job_id):
+    job = job_manager.snapshot(job_id)
+    if not job:
+        return jsonify({"success": False, "error": f"Job {job_id} not found"}), 404
+    workbook = next((path for path in job["artifacts"] if path.endswith('.xlsx')), None)
+    if not workbook:
+        return jsonify({"success": False, "error": "No artifact available yet", "status": job["status"]}), 404
+    
+    return send_file(os.path.abspath(workbook), as_attachment=True)
+
 if __name__ == '__main__':
     print("Starting Multi-VC Portfolio Twitter Analysis")
+    vc_urls = shared_state.vc_urls()
     print(f"Configured to scrape {len(vc_urls)} VC sites:")
     for i, url in enumerate(vc_urls, 1):
         print(f"  {i}. {url}")
@@ -638,7 +1122,11 @@ if __name__ == '__main__':
     print("\nTo add more VC sites, use: POST /add_vc with {'url': 'https://example.com'}")
     print("Or use the Flask API at http://localhost:5002")
     
+    import atexit
+    atexit.register(shutdown)
+    
     analyze_all_portfolio_companies()
     
+    # Development server; run `gunicorn -c gunicorn.conf.py twitter_scraper_service:app` to use every core
     port = int(os.environ.get('PORT', 5002))
-    app.run(host='0.0.0.0', port=port, debug=True)
+    app.run(host='0.0.0.0', port=port, debug=os.environ.get('FLASK_DEBUG') == '1')
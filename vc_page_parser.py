@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+HTML parsing backends for VC portfolio pages
+The site scrapers only use get_text/find/find_all, so the same extraction
+code runs on lxml (C-backed, compiled XPath selectors) or on BeautifulSoup,
+which remains the fallback when lxml is missing or rejects a page.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from lazy_import import is_available, lazy_module
+
+# Parsers are imported when the first page is parsed
+bs4 = lazy_module('bs4')
+BS4_AVAILABLE = is_available('bs4')
+
+lxml_html = lazy_module('lxml.html')
+etree = lazy_module('lxml.etree')
+LXML_AVAILABLE = is_available('lxml')
+
+logger = logging.getLogger(__name__)
+
+# BeautifulSoup's get_text() leaves these out, so the lxml tree drops them too
+NON_TEXT_TAGS = ('script', 'style', 'template')
+
+
+class SoupPage:
+    """BeautifulSoup-backed page; returned elements are plain bs4 Tags"""
+
+    backend = 'bs4'
+
+    def __init__(self, content):
+        self.soup = bs4.BeautifulSoup(content, 'html.parser')
+
+    def get_text(self) -> str:
+        return self.soup.get_text()
+
+    def find_all(self, tags: Sequence[str], class_words: Optional[Sequence[str]] = None, attr: Optional[str] = None):
+        kwargs = {}
+        if class_words:
+            kwargs['class_'] = re.compile('|'.join(re.escape(word) for word in class_words))
+        if attr:
+            kwargs[attr] = True
+        return self.soup.find_all(list(tags), **kwargs)
+
+
+class LxmlNode:
+    """Element wrapper exposing the subset of the bs4 Tag API the scrapers use"""
+
+    __slots__ = ('element',)
+
+    def __init__(self, element):
+        self.element = element
+
+    def get_text(self) -> str:
+        return ''.join(self.element.itertext())
+
+    def find(self, tags: Sequence[str]) -> Optional['LxmlNode']:
+        element = next(self.element.iterdescendants(*tags), None)
+        return LxmlNode(element) if element is not None else None
+
+    def find_all(self, tags: Sequence[str]) -> List['LxmlNode']:
+        return [LxmlNode(element) for element in self.element.iterdescendants(*tags)]
+
+
+class LxmlPage:
+    """lxml-backed page using XPath selectors compiled once per query shape"""
+
+    backend = 'lxml'
+    _selectors: Dict[Tuple, 'etree.XPath'] = {}
+
+    def __init__(self, content):
+        if isinstance(content, bytes):
+            try:
+                content = content.decode('utf-8')
+            except UnicodeDecodeError:
+                pass
+
+        try:
+            self.root = lxml_html.document_fromstring(content)
+        except ValueError:
+            # Unicode input with an XML encoding declaration must be parsed as bytes
+            self.root = lxml_html.document_fromstring(content.encode('utf-8'))
+
+        etree.strip_elements(self.root, *NON_TEXT_TAGS, with_tail=False)
+
+    def get_text(self) -> str:
+        return ''.join(self.root.itertext())
+
+    def find_all(self, tags: Sequence[str], class_words: Optional[Sequence[str]] = None, attr: Optional[str] = None) -> List[LxmlNode]:
+        selector = self.compile_selector(tuple(tags), tuple(class_words or ()), attr)
+        return [LxmlNode(element) for element in selector(self.root)]
+
+    @classmethod
+    def compile_selector(cls, tags: Tuple[str, ...], class_words: Tuple[str, ...], attr: Optional[str]) -> 'etree.XPath':
+        key = (tags, class_words, attr)
+        selector = cls._selectors.get(key)
+        if selector is None:
+            conditions = ['(' + ' or '.join(f'self::{tag}' for tag in tags) + ')']
+            if class_words:
+                conditions.append('(' + ' or '.join(f'contains(@class, "{word}")' for word in class_words) + ')')
+            if attr:
+                conditions.append(f'@{attr}')
+            selector = etree.XPath(f"descendant-or-self::*[{' and '.join(conditions)}]")
+            cls._selectors[key] = selector
+        return selector
+
+
+def available_backends() -> List[str]:
+    backends = []
+    if LXML_AVAILABLE:
+        backends.append('lxml')
+    if BS4_AVAILABLE:
+        backends.append('bs4')
+    return backends
+
+
+def parse_page(content, backend: str = 'lxml'):
+    """Parse a page with the requested backend, falling back to BeautifulSoup"""
+    if backend == 'lxml' and LXML_AVAILABLE:
+        try:
+            return LxmlPage(content)
+        except (etree.ParserError, ValueError) as e:
+            if not BS4_AVAILABLE:
+                raise
+            logger.warning(f"lxml could not parse page, falling back to BeautifulSoup: {e}")
+    if not BS4_AVAILABLE:
+        raise RuntimeError("No HTML parser available - install lxml or beautifulsoup4")
+    return SoupPage(content)